@@ -7,6 +7,7 @@ from fastapi import FastAPI
 from fastapi.exception_handlers import request_validation_exception_handler
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 
 import BASED.conf as conf
@@ -17,6 +18,7 @@ import BASED.middlewares as middlewares
 import BASED.migrations_runner as migrations_runner
 from BASED.state import app_state
 from BASED.views.dashboard.views import router as dashboard_router
+from BASED.views.export.views import router as export_router
 from BASED.views.task.views import router as task_router
 from BASED.views.user.views import router as user_router
 
@@ -29,25 +31,26 @@ sentry_sdk.init(
     environment=conf.ENVIRONMENT,
 )
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
-app.middleware("http")(middlewares.access_log_middleware)
-app.middleware("http")(middlewares.request_time_middleware)
-app.middleware("http")(middlewares.request_status_middleware)
-app.middleware("http")(middlewares.request_id_middleware)
+app.add_middleware(middlewares.UnitOfWorkMiddleware)
+app.add_middleware(middlewares.ObservabilityMiddleware)
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"])
 
 app.include_router(user_router)
 app.include_router(task_router)
 app.include_router(dashboard_router)
+app.include_router(export_router)
 
 
 @app.on_event("startup")
 async def setup():
     if conf.ENVIRONMENT == "dev":
         await asyncio.sleep(5)
-    migrations_runner.apply()
-    metrics.expose_prometheus()
+    if conf.APPLY_MIGRATIONS:
+        migrations_runner.apply()
+    if conf.PROMETHEUS_EXPOSE:
+        metrics.expose_prometheus()
     helpers.create_storage_folders()
     await app_state.startup()
 
@@ -55,6 +58,7 @@ async def setup():
 @app.on_event("shutdown")
 async def shutdown():
     await app_state.shutdown()
+    metrics.mark_process_dead()
 
 
 @app.exception_handler(RequestValidationError)
@@ -0,0 +1,42 @@
+from collections import OrderedDict
+from typing import Hashable
+
+
+class ResponseCache:
+    """
+    LRU-кэш сериализованных ответов с ограничением по количеству записей
+    и суммарному размеру.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._size = 0
+
+    def get(self, key: Hashable) -> bytes | None:
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def set(self, key: Hashable, body: bytes) -> None:
+        if len(body) > self._max_bytes:
+            return
+
+        old_body = self._entries.pop(key, None)
+        if old_body is not None:
+            self._size -= len(old_body)
+
+        self._entries[key] = body
+        self._size += len(body)
+        while (
+            len(self._entries) > self._max_entries
+            or self._size > self._max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
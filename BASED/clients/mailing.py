@@ -6,29 +6,68 @@ import aiosmtplib
 
 
 class MailClient:
-    def __init__(self, host: str, port: int, username: str, password: str):
+    """
+    Клиент SMTP с одной постоянной сессией. Соединение открывается
+    и авторизуется при первой отправке и переиспользуется дальше.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        sender: str,
+        use_tls: bool = True,
+    ):
         self._host = host
         self._port = port
         self._username = username
         self._password = password
+        self._sender = sender
+        self._use_tls = use_tls
+        self._tls_context = SSLContext() if use_tls else None
+        self._smtp: aiosmtplib.SMTP | None = None
+
+    @property
+    def is_connected(self) -> bool:
+        return self._smtp is not None and self._smtp.is_connected
+
+    async def connect(self) -> None:
+        await self.close()
+        smtp = aiosmtplib.SMTP(
+            hostname=self._host,
+            port=self._port,
+            use_tls=self._use_tls,
+            tls_context=self._tls_context,
+            timeout=10,
+        )
+        await smtp.connect()
+        if self._username:
+            await smtp.login(self._username, self._password)
+        self._smtp = smtp
+
+    async def close(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is None or not smtp.is_connected:
+            return
+
+        try:
+            await smtp.quit()
+        except aiosmtplib.SMTPException:
+            smtp.close()
 
     async def send_message(
         self, to: str | Sequence[str], subject: str, text: str
     ):
+        if not self.is_connected:
+            await self.connect()
+
         message = EmailMessage()
         message.set_content(text, "html")
         message["Subject"] = subject
-        message["From"] = self._username
-        message["To"] = to
-        await aiosmtplib.send(
-            message,
-            sender=self._username,
-            recipients=to,
-            hostname=self._host,
-            port=self._port,
-            username=self._username,
-            password=self._password,
-            use_tls=True,
-            tls_context=SSLContext(),
-            timeout=10,
+        message["From"] = self._sender
+        message["To"] = to if isinstance(to, str) else ", ".join(to)
+        await self._smtp.send_message(
+            message, sender=self._sender, recipients=to
         )
@@ -5,11 +5,22 @@ STORAGE_DIR = os.environ["TL_STORAGE_DIR"]
 
 SESSION_TTL_HOURS = 10
 DATABASE_DSN = os.environ["TL_DATABASE_DSN"]
+DATABASE_POOL_MIN_SIZE = int(os.environ.get("TL_DATABASE_POOL_MIN_SIZE", 10))
+DATABASE_POOL_MAX_SIZE = int(os.environ.get("TL_DATABASE_POOL_MAX_SIZE", 10))
+DATABASE_STATEMENT_CACHE_SIZE = int(
+    os.environ.get("TL_DATABASE_STATEMENT_CACHE_SIZE", 100)
+)
+DATABASE_PGBOUNCER = bool(os.environ.get("TL_DATABASE_PGBOUNCER"))
+DATABASE_LISTEN_DSN = os.environ.get("TL_DATABASE_LISTEN_DSN") or DATABASE_DSN
 
 AUTO_RELOAD = bool(os.environ.get("TL_AUTO_RELOAD"))
+WORKERS = int(os.environ.get("TL_WORKERS", os.cpu_count() or 1))
+APPLY_MIGRATIONS = os.environ.get("TL_APPLY_MIGRATIONS", "true") == "true"
 
 PROMETHEUS_NAME_PREFIX = os.environ.get("TL_PROMETHEUS_NAME_PREFIX")
 PROMETHEUS_PORT = int(os.environ.get("TL_PROMETHEUS_PORT", 9100))
+PROMETHEUS_EXPOSE = os.environ.get("TL_PROMETHEUS_EXPOSE", "true") == "true"
+PROMETHEUS_MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
 
 SENTRY_DSN = os.environ["TL_SENTRY_DSN"]
 ENVIRONMENT = os.environ.get("TL_ENVIRONMENT", "unknown")
@@ -20,5 +31,14 @@ SMTP_HOST = os.environ["SMTP_HOST"]
 SMTP_PORT = os.environ["SMTP_PORT"]
 SMTP_USERNAME = os.environ["SMTP_USERNAME"]
 SMTP_PASSWORD = os.environ["SMTP_PASSWORD"]
+SMTP_SENDER = os.environ.get("SMTP_SENDER") or SMTP_USERNAME
+SMTP_USE_TLS = os.environ.get("SMTP_USE_TLS", "true") == "true"
 
 USER_EMAIL = os.environ["USER_EMAIL"]
+
+RESPONSE_CACHE_MAX_ENTRIES = int(
+    os.environ.get("TL_RESPONSE_CACHE_MAX_ENTRIES", 256)
+)
+RESPONSE_CACHE_MAX_BYTES = int(
+    os.environ.get("TL_RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+)
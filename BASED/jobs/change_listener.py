@@ -0,0 +1,123 @@
+import asyncio
+import logging
+
+import orjson
+from asyncpg import Connection, connect
+
+from BASED.repository.task import TaskRepository
+from BASED.repository.version import DataVersion
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "based_changes"
+PING_SECONDS = 30
+RETRY_BASE_SECONDS = 1
+RETRY_MAX_SECONDS = 60
+
+
+class ChangeListener:
+    """
+    Слушает уведомления об изменениях данных, которые триггеры базы
+    отправляют в канал CHANNEL, и применяет изменения других
+    процессов: увеличивает версию данных (инвалидируя кэш ответов)
+    и обновляет граф задач. Собственные изменения процесса
+    распознаются по application_name соединений пула.
+    После переподключения граф перечитывается целиком, так как
+    уведомления за время разрыва потеряны.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        source: str,
+        task_repo: TaskRepository,
+        version: DataVersion,
+    ) -> None:
+        self._dsn = dsn
+        self._source = source
+        self._task_repo = task_repo
+        self._version = version
+        self._event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._task_ids: set[int] = set()
+        self._reload = False
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self._task:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def _on_notification(
+        self, conn: Connection, pid: int, channel: str, payload: str
+    ) -> None:
+        change = orjson.loads(payload)
+        if change["source"] == self._source:
+            return
+
+        self._version.bump(notify_subscribers=False)
+        match change["entity"], change["operation"]:
+            case ("task", "insert") | ("task_depends", _):
+                if change["ids"] is None:
+                    self._reload = True
+                else:
+                    self._task_ids.update(change["ids"])
+                self._event.set()
+
+    async def _refresh_graph(self) -> None:
+        task_ids, self._task_ids = self._task_ids, set()
+        reload, self._reload = self._reload, False
+        if reload:
+            await self._task_repo.load_graph()
+        elif task_ids:
+            await self._task_repo.refresh_graph(list(task_ids))
+
+    async def _listen(self, resync: bool) -> None:
+        conn = await connect(dsn=self._dsn)
+        try:
+            conn.add_termination_listener(lambda _: self._event.set())
+            await conn.add_listener(CHANNEL, self._on_notification)
+            if resync:
+                self._version.bump(notify_subscribers=False)
+                self._reload = True
+                self._event.set()
+            logger.info("Listening for changes. channel=%s", CHANNEL)
+
+            while not conn.is_closed():
+                try:
+                    await asyncio.wait_for(
+                        self._event.wait(), timeout=PING_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    await conn.execute("select 1")
+                    continue
+
+                self._event.clear()
+                await self._refresh_graph()
+        finally:
+            if not conn.is_closed():
+                await conn.close()
+
+    async def _run(self) -> None:
+        resync = False
+        retry_seconds = 0
+        while True:
+            try:
+                await self._listen(resync)
+                retry_seconds = 0
+            except Exception:
+                logger.exception("Change listener failed")
+                retry_seconds = min(
+                    max(retry_seconds * 2, RETRY_BASE_SECONDS),
+                    RETRY_MAX_SECONDS,
+                )
+
+            resync = True
+            await asyncio.sleep(retry_seconds)
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+
+import aiosmtplib
+
+from BASED.clients.mailing import MailClient
+from BASED.repository.mail_outbox import MailOutboxRepository
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+LEASE_SECONDS = 300
+MAX_ATTEMPTS = 10
+POLL_SECONDS = 30
+RETRY_BASE_SECONDS = 5
+RETRY_MAX_SECONDS = 600
+
+
+def get_retry_seconds(attempts: int) -> int:
+    return min(
+        RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), RETRY_MAX_SECONDS
+    )
+
+
+class MailDispatcher:
+    """
+    Фоновая отправка писем из очереди. Письма отправляются пачками
+    через одну сессию SMTP, которая закрывается после POLL_SECONDS
+    простоя. При ошибках соединения сессия переоткрывается
+    с экспоненциально растущей задержкой.
+    """
+
+    def __init__(self, repo: MailOutboxRepository, client: MailClient):
+        self._repo = repo
+        self._client = client
+        self._event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        await self._client.close()
+
+    def request_dispatch(self) -> None:
+        self._event.set()
+
+    async def enqueue(self, messages: list[tuple[list[str], str, str]]):
+        """
+        Добавляет письма (получатели, тема, текст) в очередь
+        и будит отправку, не дожидаясь её.
+        """
+        await self._repo.enqueue(messages)
+        self.request_dispatch()
+
+    async def dispatch(self) -> int:
+        """
+        Отправляет одну пачку писем. Письма, отклонённые сервером,
+        откладываются на следующую попытку; при обрыве соединения
+        неотправленные письма возвращаются в очередь.
+        Возвращает количество забранных писем.
+        """
+        messages = await self._repo.claim_batch(
+            limit=BATCH_SIZE,
+            lease_seconds=LEASE_SECONDS,
+            max_attempts=MAX_ATTEMPTS,
+        )
+        if not messages:
+            return 0
+
+        handled_ids = set()
+        sent_ids = []
+        try:
+            if not self._client.is_connected:
+                await self._client.connect()
+
+            for message in messages:
+                try:
+                    await self._client.send_message(
+                        to=message.recipients,
+                        subject=message.subject,
+                        text=message.text,
+                    )
+                except (
+                    aiosmtplib.SMTPRecipientsRefused,
+                    aiosmtplib.SMTPResponseException,
+                ) as e:
+                    logger.error(
+                        "Message rejected. id=%s error=%s", message.id, e
+                    )
+                    await self._repo.mark_failed(
+                        id_=message.id,
+                        retry_seconds=get_retry_seconds(message.attempts),
+                        error=str(e),
+                    )
+                else:
+                    sent_ids.append(message.id)
+                handled_ids.add(message.id)
+        finally:
+            if sent_ids:
+                await self._repo.mark_sent(sent_ids)
+            unhandled_ids = [
+                message.id
+                for message in messages
+                if message.id not in handled_ids
+            ]
+            if unhandled_ids:
+                await self._repo.release(unhandled_ids)
+
+        logger.info(
+            "Mail batch dispatched. sent=%s failed=%s",
+            len(sent_ids),
+            len(messages) - len(sent_ids),
+        )
+        return len(messages)
+
+    async def _run(self) -> None:
+        retry_seconds = 0
+        while True:
+            self._event.clear()
+            try:
+                claimed = await self.dispatch()
+            except Exception:
+                logger.exception("Mail dispatch failed")
+                await self._client.close()
+                retry_seconds = min(
+                    max(retry_seconds * 2, RETRY_BASE_SECONDS),
+                    RETRY_MAX_SECONDS,
+                )
+                await asyncio.sleep(retry_seconds)
+                continue
+
+            retry_seconds = 0
+            if claimed == BATCH_SIZE:
+                continue
+
+            try:
+                await asyncio.wait_for(
+                    self._event.wait(), timeout=POLL_SECONDS
+                )
+            except asyncio.TimeoutError:
+                await self._client.close()
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta
+
+from BASED.jobs.mail_dispatcher import MailDispatcher
+from BASED.repository.task import Task
+from BASED.repository.task_warning import (
+    RaisedWarning,
+    TaskWarning,
+    TaskWarningRepository,
+)
+from BASED.views.dashboard.models import WarningTypeEnum
+from BASED.views.dashboard.warnings import get_tasks_warnings
+from BASED.views.user.helpers import get_warning_messages
+
+logger = logging.getLogger(__name__)
+
+REBUILD_DELAY_SECONDS = 1
+NOTIFY_WARNING_TYPES = [
+    WarningTypeEnum.start_hard,
+    WarningTypeEnum.finish_hard,
+    WarningTypeEnum.cross_hard,
+    WarningTypeEnum.late_deadline,
+]
+
+
+def get_seconds_to_midnight() -> float:
+    now = datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), time.min)
+    return (midnight - now).total_seconds()
+
+
+class WarningSnapshotJob:
+    """
+    Фоновый пересчёт снимка предупреждений: при запуске, каждую полночь
+    и после изменений данных. Изменения, пришедшие в течение
+    REBUILD_DELAY_SECONDS, объединяются в один пересчёт.
+    После пересчёта ответственным отправляются письма о новых
+    предупреждениях типов NOTIFY_WARNING_TYPES.
+    """
+
+    def __init__(
+        self,
+        repo: TaskWarningRepository,
+        mail_dispatcher: MailDispatcher | None = None,
+    ) -> None:
+        self._repo = repo
+        self._mail_dispatcher = mail_dispatcher
+        self._event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self._task:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def request_rebuild(self) -> None:
+        self._event.set()
+
+    async def rebuild(self) -> None:
+        as_of = date.today()
+
+        def compute(tasks: list[Task]) -> list[TaskWarning]:
+            warnings = get_tasks_warnings(tasks, as_of)
+            return [
+                TaskWarning(
+                    task_id=task_id,
+                    position=position,
+                    type=warning.type,
+                    warning_task_id=warning.task_id,
+                )
+                for task_id, task_warnings in warnings.items()
+                for position, warning in enumerate(task_warnings)
+            ]
+
+        messages = []
+
+        def notify(
+            warnings: list[RaisedWarning],
+        ) -> list[tuple[list[str], str, str]]:
+            messages[:] = get_warning_messages(warnings)
+            return messages
+
+        count = await self._repo.rebuild_snapshot(
+            as_of=as_of,
+            compute=compute,
+            notify_types=NOTIFY_WARNING_TYPES,
+            notify=notify if self._mail_dispatcher else None,
+        )
+        if count is None:
+            logger.info("Warning snapshot rebuild skipped. as_of=%s", as_of)
+            return
+
+        logger.info(
+            "Warning snapshot rebuilt. as_of=%s count=%s messages=%s",
+            as_of,
+            count,
+            len(messages),
+        )
+        if messages:
+            self._mail_dispatcher.request_dispatch()
+
+    async def _run(self) -> None:
+        while True:
+            self._event.clear()
+            try:
+                await self.rebuild()
+            except Exception:
+                logger.exception("Warning snapshot rebuild failed")
+
+            try:
+                await asyncio.wait_for(
+                    self._event.wait(), timeout=get_seconds_to_midnight()
+                )
+                await asyncio.sleep(REBUILD_DELAY_SECONDS)
+            except asyncio.TimeoutError:
+                pass
@@ -1,5 +1,7 @@
-from prometheus_client import start_http_server
-from prometheus_client.metrics import Counter, Histogram
+import os
+
+from prometheus_client import multiprocess, start_http_server
+from prometheus_client.metrics import Counter, Gauge, Histogram
 
 import BASED.conf as conf
 
@@ -31,9 +33,48 @@ request_time = Histogram(
     labelnames=["name"],
 )
 
+db_query_time = Histogram(
+    name=f"{prefix}db_query_time",
+    documentation="Repository method time.",
+    labelnames=["method"],
+)
+
+db_query_rows = Histogram(
+    name=f"{prefix}db_query_rows",
+    documentation="Rows returned by repository method.",
+    labelnames=["method"],
+    buckets=(0, 1, 10, 100, 1000, 10000, 100000, float("inf")),
+)
+
+db_pool_size = Gauge(
+    name=f"{prefix}db_pool_size",
+    documentation="Database pool size.",
+    multiprocess_mode="livesum",
+)
+
+db_pool_idle_size = Gauge(
+    name=f"{prefix}db_pool_idle_size",
+    documentation="Idle connections in database pool.",
+    multiprocess_mode="livesum",
+)
+
+db_pool_acquire_time = Histogram(
+    name=f"{prefix}db_pool_acquire_time",
+    documentation="Database connection acquire wait time.",
+)
+
 
 def expose_prometheus() -> None:
     """
     Запускает сервер с метриками для prometheus.
     """
     start_http_server(port=conf.PROMETHEUS_PORT)
+
+
+def mark_process_dead() -> None:
+    """
+    Удаляет значения gauge завершающегося процесса при сборе метрик
+    нескольких процессов.
+    """
+    if conf.PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
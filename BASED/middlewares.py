@@ -1,75 +1,103 @@
 import logging
 import time
 from contextvars import ContextVar
+from functools import lru_cache
 from uuid import uuid4
 
-from fastapi import Request, Response
+from starlette.datastructures import URL, Headers
 from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 import BASED.metrics as metrics
+from BASED.state import app_state
 
 logger = logging.getLogger(__name__)
 request_id_contextvar = ContextVar("request_id_contextvar")
 
 
-def _get_url_name(request: Request) -> str:
-    for route in request.app.routes:
-        match, _ = route.matches(request.scope)
+URL_NAME_CACHE_SIZE = 1024
+
+
+def _get_url_name(scope: Scope) -> str:
+    """
+    Получает шаблон пути для меток метрик. Берёт маршрут, который
+    роутер уже сохранил в scope, иначе ищет его в кэше по методу и пути.
+    """
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+
+    return _match_url_name(scope["app"], scope["method"], scope["path"])
+
+
+@lru_cache(maxsize=URL_NAME_CACHE_SIZE)
+def _match_url_name(app: ASGIApp, method: str, path: str) -> str:
+    scope = {"type": "http", "method": method, "path": path, "root_path": ""}
+    for route in app.routes:
+        match, _ = route.matches(scope)
         if match == Match.FULL:
             return route.path
 
     return "not_matched"
 
 
-async def request_id_middleware(request: Request, call_next):
+class ObservabilityMiddleware:
+    """
+    Добавляет request_id в контекст, замеряет время запроса,
+    считает статусы ответов и пишет access log.
+    Работает на уровне ASGI и не буферизует тело ответа.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get("X-Request-Id")
+        if not request_id:
+            request_id = str(uuid4())
+
+        status = None
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = request_id_contextvar.set(request_id)
+        time_start = time.monotonic()
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            status = 500
+            raise
+        finally:
+            time_elapsed = time.monotonic() - time_start
+            name = _get_url_name(scope)
+            metrics.request_time.labels(name=name).observe(time_elapsed)
+            metrics.request_status_count.labels(name=name, status=status).inc()
+            logger.info("%s %s %s", status, scope["method"], URL(scope=scope))
+            request_id_contextvar.reset(token)
+
+
+class UnitOfWorkMiddleware:
     """
-    Добавляет request_id в контекст.
+    Привязывает к каждому HTTP-запросу одно соединение с базой.
+    Соединение берётся из пула только при первом обращении к базе
+    и возвращается после отправки ответа.
     """
-    request_id = request.headers.get("X-Request-Id")
-    if not request_id:
-        request_id = str(uuid4())
-
-    token = request_id_contextvar.set(request_id)
-    try:
-        return await call_next(request)
-    finally:
-        request_id_contextvar.reset(token)
-
-
-async def access_log_middleware(request: Request, call_next):
-    status = None
-    try:
-        response: Response = await call_next(request)
-        status = response.status_code
-        return response
-    except Exception:
-        status = 500
-        raise
-    finally:
-        logger.info("%s %s %s", status, request.method, request.url)
-
-
-async def request_time_middleware(request: Request, call_next):
-    time_start = time.monotonic()
-    try:
-        return await call_next(request)
-    finally:
-        time_elapsed = time.monotonic() - time_start
-        metrics.request_time.labels(name=_get_url_name(request)).observe(
-            time_elapsed
-        )
-
-
-async def request_status_middleware(request: Request, call_next):
-    status = None
-    try:
-        response: Response = await call_next(request)
-        status = response.status_code
-        return response
-    except Exception:
-        status = 500
-        raise
-    finally:
-        metrics.request_status_count.labels(
-            name=_get_url_name(request), status=status
-        ).inc()
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async with app_state.db.unit_of_work():
+            await self.app(scope, receive, send)
@@ -0,0 +1,3 @@
+drop index "task_depends_depends_task_id_idx";
+drop index "task_active_deadline_idx";
+drop index "task_responsible_user_id_idx";
\ No newline at end of file
@@ -0,0 +1,7 @@
+-- depends: 0001.initial
+create index "task_depends_depends_task_id_idx"
+    on "task_depends" ("depends_task_id", "task_id");
+create index "task_active_deadline_idx"
+    on "task" ("deadline") where not "is_archived";
+create index "task_responsible_user_id_idx"
+    on "task" ("responsible_user_id");
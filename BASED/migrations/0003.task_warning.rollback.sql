@@ -0,0 +1,5 @@
+drop trigger "task_depends_invalidate_warning_snapshot" on "task_depends";
+drop trigger "task_invalidate_warning_snapshot" on "task";
+drop function "invalidate_task_warning_snapshot"();
+drop table "task_warning";
+drop table "task_warning_snapshot";
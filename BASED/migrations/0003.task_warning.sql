@@ -0,0 +1,27 @@
+-- depends: 0002.indexes
+create table "task_warning_snapshot"(
+    "as_of" date primary key,
+    "created_timestamp" timestamp not null default (now() at time zone 'utc')
+);
+create table "task_warning"(
+    "as_of" date not null,
+    "task_id" int not null,
+    "position" int not null,
+    "type" varchar(16) not null,
+    "warning_task_id" int not null,
+    primary key ("as_of", "task_id", "position")
+);
+
+create function "invalidate_task_warning_snapshot"() returns trigger as $$
+begin
+    delete from "task_warning_snapshot";
+    return null;
+end;
+$$ language plpgsql;
+
+create trigger "task_invalidate_warning_snapshot"
+    after insert or update or delete on "task"
+    for each statement execute function "invalidate_task_warning_snapshot"();
+create trigger "task_depends_invalidate_warning_snapshot"
+    after insert or update or delete on "task_depends"
+    for each statement execute function "invalidate_task_warning_snapshot"();
@@ -0,0 +1,8 @@
+drop trigger "task_update_refresh_cross_deadline" on "task";
+drop trigger "task_depends_delete_refresh_cross_deadline" on "task_depends";
+drop trigger "task_depends_insert_refresh_cross_deadline" on "task_depends";
+drop function "task_update_refresh_cross_deadline"();
+drop function "task_depends_delete_refresh_cross_deadline"();
+drop function "task_depends_insert_refresh_cross_deadline"();
+drop function "refresh_cross_deadline"(int[]);
+alter table "task" drop column "cross_finish_date";
@@ -0,0 +1,94 @@
+-- depends: 0003.task_warning
+alter table "task" add column "cross_finish_date" date;
+
+create function "refresh_cross_deadline"(task_ids int[]) returns void as $$
+begin
+    update "task"
+    set "cross_deadline" = "latest"."deadline",
+        "task_delay_caused_by" = "latest"."id",
+        "cross_finish_date" = "latest"."actual_finish_date"
+    from (select distinct unnest(task_ids) as "id") as "target"
+    left join lateral (
+        select "dependent"."id", "dependent"."deadline",
+         "dependent"."actual_finish_date"
+        from "task_depends" join "task" as "dependent"
+        on "dependent"."id" = "task_depends"."task_id"
+        where "task_depends"."depends_task_id" = "target"."id"
+        order by "dependent"."deadline" desc
+        limit 1
+    ) as "latest" on true
+    where "task"."id" = "target"."id"
+    and (
+        "task"."cross_deadline",
+        "task"."task_delay_caused_by",
+        "task"."cross_finish_date"
+    ) is distinct from (
+        "latest"."deadline", "latest"."id", "latest"."actual_finish_date"
+    );
+end;
+$$ language plpgsql;
+
+create function "task_depends_insert_refresh_cross_deadline"()
+returns trigger as $$
+declare
+    task_ids int[];
+begin
+    task_ids := array(select "depends_task_id" from "new_rows");
+    if cardinality(task_ids) > 0 then
+        perform "refresh_cross_deadline"(task_ids);
+    end if;
+    return null;
+end;
+$$ language plpgsql;
+
+create function "task_depends_delete_refresh_cross_deadline"()
+returns trigger as $$
+declare
+    task_ids int[];
+begin
+    task_ids := array(select "depends_task_id" from "old_rows");
+    if cardinality(task_ids) > 0 then
+        perform "refresh_cross_deadline"(task_ids);
+    end if;
+    return null;
+end;
+$$ language plpgsql;
+
+create function "task_update_refresh_cross_deadline"()
+returns trigger as $$
+declare
+    task_ids int[];
+begin
+    task_ids := array(
+        select "task_depends"."depends_task_id"
+        from "new_rows" join "old_rows"
+        on "old_rows"."id" = "new_rows"."id"
+        join "task_depends" on "task_depends"."task_id" = "new_rows"."id"
+        where ("new_rows"."deadline", "new_rows"."actual_finish_date")
+         is distinct from
+         ("old_rows"."deadline", "old_rows"."actual_finish_date")
+    );
+    if cardinality(task_ids) > 0 then
+        perform "refresh_cross_deadline"(task_ids);
+    end if;
+    return null;
+end;
+$$ language plpgsql;
+
+create trigger "task_depends_insert_refresh_cross_deadline"
+    after insert on "task_depends"
+    referencing new table as "new_rows"
+    for each statement
+    execute function "task_depends_insert_refresh_cross_deadline"();
+create trigger "task_depends_delete_refresh_cross_deadline"
+    after delete on "task_depends"
+    referencing old table as "old_rows"
+    for each statement
+    execute function "task_depends_delete_refresh_cross_deadline"();
+create trigger "task_update_refresh_cross_deadline"
+    after update on "task"
+    referencing new table as "new_rows" old table as "old_rows"
+    for each statement
+    execute function "task_update_refresh_cross_deadline"();
+
+select "refresh_cross_deadline"(array(select "id" from "task"));
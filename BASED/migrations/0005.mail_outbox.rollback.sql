@@ -0,0 +1 @@
+drop table "mail_outbox";
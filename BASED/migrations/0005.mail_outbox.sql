@@ -0,0 +1,16 @@
+-- depends: 0004.cross_deadline
+create table "mail_outbox"(
+    "id" serial primary key,
+    "recipients" varchar[] not null,
+    "subject" varchar not null,
+    "text" text not null,
+    "attempts" int not null default 0,
+    "next_attempt_timestamp" timestamp not null
+     default (now() at time zone 'utc'),
+    "sent_timestamp" timestamp,
+    "last_error" text,
+    "created_timestamp" timestamp not null default (now() at time zone 'utc')
+);
+create index "mail_outbox_pending_idx"
+    on "mail_outbox" ("next_attempt_timestamp", "id")
+    where "sent_timestamp" is null;
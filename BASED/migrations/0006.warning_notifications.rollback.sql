@@ -0,0 +1,2 @@
+drop table "task_warning_notified";
+alter table "user" drop column "email";
@@ -0,0 +1,10 @@
+-- depends: 0005.mail_outbox
+alter table "user" add column "email" varchar(256);
+
+create table "task_warning_notified"(
+    "task_id" int not null references "task"("id") on delete cascade,
+    "type" varchar(16) not null,
+    "warning_task_id" int not null,
+    "created_timestamp" timestamp not null default (now() at time zone 'utc'),
+    primary key ("task_id", "type", "warning_task_id")
+);
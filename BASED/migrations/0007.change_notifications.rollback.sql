@@ -0,0 +1,7 @@
+drop trigger "user_notify_changes" on "user";
+drop trigger "task_depends_notify_changes" on "task_depends";
+drop trigger "task_depends_delete_notify_changes" on "task_depends";
+drop trigger "task_depends_insert_notify_changes" on "task_depends";
+drop trigger "task_notify_changes" on "task";
+drop trigger "task_insert_notify_changes" on "task";
+drop function "notify_based_changes"();
@@ -0,0 +1,56 @@
+-- depends: 0006.warning_notifications
+create function "notify_based_changes"() returns trigger as $$
+declare
+    ids int[];
+begin
+    if tg_table_name = 'task' and tg_op = 'INSERT' then
+        ids := array(select "id" from "new_rows");
+    elsif tg_table_name = 'task_depends' and tg_op = 'INSERT' then
+        ids := array(select distinct "task_id" from "new_rows");
+    elsif tg_table_name = 'task_depends' and tg_op = 'DELETE' then
+        ids := array(select distinct "task_id" from "old_rows");
+    end if;
+    if cardinality(ids) > 500 then
+        ids := null;
+    end if;
+
+    perform pg_notify(
+        'based_changes',
+        json_build_object(
+            'entity', tg_table_name,
+            'operation', lower(tg_op),
+            'ids', ids,
+            'source', current_setting('application_name')
+        )::text
+    );
+    return null;
+end;
+$$ language plpgsql;
+
+create trigger "task_insert_notify_changes"
+    after insert on "task"
+    referencing new table as "new_rows"
+    for each statement
+    execute function "notify_based_changes"();
+create trigger "task_notify_changes"
+    after update or delete on "task"
+    for each statement
+    execute function "notify_based_changes"();
+create trigger "task_depends_insert_notify_changes"
+    after insert on "task_depends"
+    referencing new table as "new_rows"
+    for each statement
+    execute function "notify_based_changes"();
+create trigger "task_depends_delete_notify_changes"
+    after delete on "task_depends"
+    referencing old table as "old_rows"
+    for each statement
+    execute function "notify_based_changes"();
+create trigger "task_depends_notify_changes"
+    after update on "task_depends"
+    for each statement
+    execute function "notify_based_changes"();
+create trigger "user_notify_changes"
+    after insert or update or delete on "user"
+    for each statement
+    execute function "notify_based_changes"();
@@ -0,0 +1,9 @@
+create or replace function "invalidate_task_warning_snapshot"()
+returns trigger as $$
+begin
+    delete from "task_warning_snapshot";
+    return null;
+end;
+$$ language plpgsql;
+
+drop table "task_warning_rebuild";
@@ -0,0 +1,14 @@
+-- depends: 0007.change_notifications
+create table "task_warning_rebuild"(
+    "id" serial primary key,
+    "created_timestamp" timestamp not null default (now() at time zone 'utc')
+);
+
+create or replace function "invalidate_task_warning_snapshot"()
+returns trigger as $$
+begin
+    delete from "task_warning_snapshot";
+    delete from "task_warning_rebuild";
+    return null;
+end;
+$$ language plpgsql;
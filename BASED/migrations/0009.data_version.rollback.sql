@@ -0,0 +1,5 @@
+drop trigger "user_bump_data_version" on "user";
+drop trigger "task_depends_bump_data_version" on "task_depends";
+drop trigger "task_bump_data_version" on "task";
+drop function "bump_data_version"();
+drop table "data_version";
@@ -0,0 +1,33 @@
+-- depends: 0008.task_warning_rebuild
+create table "data_version"(
+    "id" boolean primary key default true check ("id"),
+    "value" bigint not null default 0
+);
+insert into "data_version" default values;
+
+create function "bump_data_version"() returns trigger as $$
+begin
+    if current_setting('based.data_version_bumped', true)
+     is distinct from 'on' then
+        perform set_config('based.data_version_bumped', 'on', true);
+        update "data_version" set "value" = "value" + 1;
+    end if;
+    return null;
+end;
+$$ language plpgsql;
+
+create constraint trigger "task_bump_data_version"
+    after insert or update or delete on "task"
+    deferrable initially deferred
+    for each row
+    execute function "bump_data_version"();
+create constraint trigger "task_depends_bump_data_version"
+    after insert or update or delete on "task_depends"
+    deferrable initially deferred
+    for each row
+    execute function "bump_data_version"();
+create constraint trigger "user_bump_data_version"
+    after insert or update or delete on "user"
+    deferrable initially deferred
+    for each row
+    execute function "bump_data_version"();
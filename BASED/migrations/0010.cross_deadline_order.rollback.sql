@@ -0,0 +1,26 @@
+create or replace function "refresh_cross_deadline"(task_ids int[]) returns void as $$
+begin
+    update "task"
+    set "cross_deadline" = "latest"."deadline",
+        "task_delay_caused_by" = "latest"."id",
+        "cross_finish_date" = "latest"."actual_finish_date"
+    from (select distinct unnest(task_ids) as "id") as "target"
+    left join lateral (
+        select "dependent"."id", "dependent"."deadline",
+         "dependent"."actual_finish_date"
+        from "task_depends" join "task" as "dependent"
+        on "dependent"."id" = "task_depends"."task_id"
+        where "task_depends"."depends_task_id" = "target"."id"
+        order by "dependent"."deadline" desc
+        limit 1
+    ) as "latest" on true
+    where "task"."id" = "target"."id"
+    and (
+        "task"."cross_deadline",
+        "task"."task_delay_caused_by",
+        "task"."cross_finish_date"
+    ) is distinct from (
+        "latest"."deadline", "latest"."id", "latest"."actual_finish_date"
+    );
+end;
+$$ language plpgsql;
@@ -0,0 +1,235 @@
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Callable
+
+from asyncpg import Connection, Pool
+
+import BASED.metrics as metrics
+
+logger = logging.getLogger(__name__)
+
+_statements: list[str] = []
+
+
+class _UnitOfWork:
+    def __init__(self) -> None:
+        self.connection: Connection | None = None
+        self.connection_lock = asyncio.Lock()
+        self.after_commit: list[Callable[[], None]] | None = None
+
+
+_unit_of_work_contextvar: ContextVar[_UnitOfWork | None] = ContextVar(
+    "unit_of_work_contextvar", default=None
+)
+
+
+def register_statement(sql: str) -> str:
+    """
+    Добавляет запрос в реестр запросов, подготавливаемых
+    на каждом новом соединении пула.
+    """
+    _statements.append(sql)
+    return sql
+
+
+async def prepare_statements(conn: Connection) -> None:
+    """
+    Подготавливает все запросы реестра в кэше запросов соединения,
+    чтобы первые обращения к ним не тратили время на разбор.
+    Публичный Connection.prepare в кэш не пишет (use_cache=False),
+    поэтому используется приватный _prepare: версия asyncpg
+    закреплена в requirements.txt, при её обновлении проверить
+    сигнатуру. Если метод пропадёт, прогрев отключается с ошибкой
+    в логе, а не ломает соединения.
+    """
+    # asyncpg==0.29.0: Connection._prepare(query, *, use_cache=...)
+    prepare = getattr(conn, "_prepare", None)
+    if prepare is None:
+        logger.error("Statement warm-up is unsupported by this asyncpg")
+        return
+
+    for sql in _statements:
+        await prepare(sql, use_cache=True)
+
+
+class Database:
+    """
+    Пул соединений с базой, снимающий метрики заполненности пула
+    и времени ожидания соединения.
+    Внутри unit_of_work все обращения к базе используют одно
+    соединение, внутри transaction - ещё и одну транзакцию.
+    """
+
+    def __init__(
+        self, pool: Pool, on_commit: Callable[[], None] | None = None
+    ) -> None:
+        self._pool = pool
+        self._on_commit = on_commit
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Connection]:
+        unit_of_work = _unit_of_work_contextvar.get()
+        if unit_of_work is None:
+            c = await self._acquire_connection()
+            try:
+                yield c
+            finally:
+                await self._release_connection(c)
+            return
+
+        if unit_of_work.connection is None:
+            async with unit_of_work.connection_lock:
+                if unit_of_work.connection is None:
+                    unit_of_work.connection = await self._acquire_connection()
+        yield unit_of_work.connection
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[None]:
+        """
+        Привязывает к текущему контексту одно соединение, которое
+        берётся из пула при первом обращении к базе и возвращается
+        при выходе из блока. Вложенные блоки используют внешний.
+        Соединение берётся под блокировкой, так что задачи, запущенные
+        внутри блока через gather, получают одно и то же соединение.
+        asyncpg не выполняет запросы на одном соединении параллельно,
+        поэтому обращения к базе внутри блока должны идти
+        последовательно.
+        """
+        if _unit_of_work_contextvar.get() is not None:
+            yield
+            return
+
+        unit_of_work = _UnitOfWork()
+        token = _unit_of_work_contextvar.set(unit_of_work)
+        try:
+            yield
+        finally:
+            _unit_of_work_contextvar.reset(token)
+            if unit_of_work.connection is not None:
+                await self._release_connection(unit_of_work.connection)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Connection]:
+        """
+        Выполняет все обращения к базе внутри блока в одной транзакции.
+        После фиксации внешней транзакции вызывается on_commit, чтобы
+        ответы, собранные по данным до фиксации, не остались в кэше,
+        и отложенные через after_commit изменения в памяти. При откате
+        отложенные изменения отбрасываются.
+        """
+        async with self.unit_of_work():
+            unit_of_work = _unit_of_work_contextvar.get()
+            if unit_of_work.after_commit is not None:
+                async with self.acquire() as c:
+                    async with c.transaction():
+                        yield c
+                return
+
+            unit_of_work.after_commit = []
+            try:
+                async with self.acquire() as c:
+                    async with c.transaction():
+                        yield c
+                callbacks = unit_of_work.after_commit
+            finally:
+                unit_of_work.after_commit = None
+
+            if self._on_commit:
+                self._on_commit()
+            for callback in callbacks:
+                callback()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Вызывает callback после фиксации текущей транзакции transaction,
+        а вне транзакции - сразу. Так изменения в памяти (граф задач)
+        не расходятся с базой после отката.
+        """
+        unit_of_work = _unit_of_work_contextvar.get()
+        if unit_of_work is None or unit_of_work.after_commit is None:
+            callback()
+            return
+
+        unit_of_work.after_commit.append(callback)
+
+    async def _acquire_connection(self) -> Connection:
+        time_start = time.monotonic()
+        c = await self._pool.acquire()
+        metrics.db_pool_acquire_time.observe(time.monotonic() - time_start)
+        self._observe_pool()
+        return c
+
+    async def _release_connection(self, c: Connection) -> None:
+        await self._pool.release(c)
+        self._observe_pool()
+
+    async def close(self) -> None:
+        await self._pool.close()
+
+    def _observe_pool(self) -> None:
+        metrics.db_pool_size.set(self._pool.get_size())
+        metrics.db_pool_idle_size.set(self._pool.get_idle_size())
+
+
+def _count_rows(result) -> int:
+    if isinstance(result, list):
+        return len(result)
+    if result is None or result is False:
+        return 0
+
+    return 1
+
+
+def observe_query(func):
+    """
+    Замеряет время выполнения метода репозитория и количество
+    полученных строк. Для асинхронных генераторов учитывается только
+    время внутри генератора и строки всех отданных пачек.
+    """
+    name = func.__qualname__
+
+    if inspect.isasyncgenfunction(func):
+
+        @functools.wraps(func)
+        async def observed_iterator(*args, **kwargs):
+            iterator = func(*args, **kwargs)
+            time_elapsed = 0
+            rows = 0
+            try:
+                while True:
+                    time_start = time.monotonic()
+                    try:
+                        chunk = await iterator.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    finally:
+                        time_elapsed += time.monotonic() - time_start
+
+                    rows += _count_rows(chunk)
+                    yield chunk
+            finally:
+                await iterator.aclose()
+                metrics.db_query_time.labels(method=name).observe(time_elapsed)
+                metrics.db_query_rows.labels(method=name).observe(rows)
+
+        return observed_iterator
+
+    @functools.wraps(func)
+    async def observed(*args, **kwargs):
+        time_start = time.monotonic()
+        try:
+            result = await func(*args, **kwargs)
+        finally:
+            metrics.db_query_time.labels(method=name).observe(
+                time.monotonic() - time_start
+            )
+
+        metrics.db_query_rows.labels(method=name).observe(_count_rows(result))
+        return result
+
+    return observed
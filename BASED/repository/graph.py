@@ -0,0 +1,111 @@
+from collections import defaultdict
+from itertools import chain, repeat
+
+import numpy as np
+
+
+class TaskGraph:
+    """
+    Граф зависимостей задач в памяти.
+    Ребро task_id -> depends_task_id означает, что задача task_id
+    зависит от задачи depends_task_id.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: set[int] = set()
+        self._depends_of: defaultdict[int, set[int]] = defaultdict(set)
+        self._dependent_for: defaultdict[int, set[int]] = defaultdict(set)
+        self._edge_arrays: tuple[np.ndarray, np.ndarray] | None = None
+
+    def load(self, task_ids: list[int], edges: list[tuple[int, int]]) -> None:
+        """
+        Полностью перестраивает граф.
+        """
+        self._nodes = set(task_ids)
+        self._depends_of = defaultdict(set)
+        self._dependent_for = defaultdict(set)
+        self._edge_arrays = None
+        for task_id, depends_task_id in edges:
+            self.add_edge(task_id, depends_task_id)
+
+    def add_node(self, task_id: int) -> None:
+        self._nodes.add(task_id)
+
+    def has_node(self, task_id: int) -> bool:
+        return task_id in self._nodes
+
+    def add_edge(self, task_id: int, depends_task_id: int) -> None:
+        self._depends_of[task_id].add(depends_task_id)
+        self._dependent_for[depends_task_id].add(task_id)
+        self._edge_arrays = None
+
+    def remove_edge(self, task_id: int, depends_task_id: int) -> None:
+        self._depends_of[task_id].discard(depends_task_id)
+        self._dependent_for[depends_task_id].discard(task_id)
+        self._edge_arrays = None
+
+    def set_depends_of(self, task_id: int, depends_ids: set[int]) -> None:
+        """
+        Заменяет все зависимости задачи task_id.
+        """
+        for depends_task_id in self.get_depends_of(task_id) - depends_ids:
+            self.remove_edge(task_id, depends_task_id)
+        for depends_task_id in depends_ids:
+            self.add_edge(task_id, depends_task_id)
+
+    def get_depends_of(self, task_id: int) -> set[int]:
+        """
+        Задачи, от которых зависит данная.
+        """
+        return self._depends_of.get(task_id, set())
+
+    def get_dependent_for(self, task_id: int) -> set[int]:
+        """
+        Задачи, которые зависят от данной.
+        """
+        return self._dependent_for.get(task_id, set())
+
+    def get_edge_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Все рёбра графа в виде массивов task_id и depends_task_id.
+        Кешируется до следующего изменения графа.
+        """
+        if self._edge_arrays is None:
+            depends_of = self._depends_of
+            count = sum(map(len, depends_of.values()))
+            task_ids = np.fromiter(
+                chain.from_iterable(
+                    repeat(task_id, len(depends_ids))
+                    for task_id, depends_ids in depends_of.items()
+                ),
+                dtype=np.int64,
+                count=count,
+            )
+            depends_task_ids = np.fromiter(
+                chain.from_iterable(depends_of.values()),
+                dtype=np.int64,
+                count=count,
+            )
+            self._edge_arrays = task_ids, depends_task_ids
+
+        return self._edge_arrays
+
+    def creates_cycle(self, task_id: int, depends_task_id: int) -> bool:
+        """
+        Проверяет, образует ли новое ребро цикл, то есть достижима ли
+        задача task_id из depends_task_id по существующим зависимостям.
+        """
+        if task_id == depends_task_id:
+            return True
+
+        visited = {depends_task_id}
+        stack = [depends_task_id]
+        while stack:
+            for next_id in self._depends_of.get(stack.pop(), ()):
+                if next_id == task_id:
+                    return True
+                if next_id not in visited:
+                    visited.add(next_id)
+                    stack.append(next_id)
+
+        return False
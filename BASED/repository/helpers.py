@@ -1,5 +1,11 @@
+from enum import Enum
+from types import NoneType, UnionType
+from typing import Callable, Mapping, TypeVar, Union, get_args, get_origin
+
 from pydantic import BaseModel
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
 
 class ModelSQL(BaseModel):
     placeholders: str
@@ -40,3 +46,52 @@ def build_model_cls_sql(model: BaseModel) -> ModelSQL:
         field_names=",".join(field_names),
         values=values,
     )
+
+
+def _get_enum_cls(annotation) -> type[Enum] | None:
+    if get_origin(annotation) in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        if len(args) != 1:
+            return
+
+        annotation = args[0]
+
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return annotation
+
+
+def build_row_mapper(model: type[ModelT]) -> Callable[[Mapping], ModelT]:
+    """
+    Компилирует преобразование строки из нашей схемы в модель без
+    валидации: типы колонок уже проверены Postgres, приводятся только
+    перечисления. Для строк с вложенным json и внешних данных нужна
+    обычная валидация.
+    """
+    namespace = {
+        "model": model,
+        "fields_set": set(model.model_fields),
+        "set_attr": object.__setattr__,
+        "set_fields_set": BaseModel.__pydantic_fields_set__.__set__,
+        "set_extra": BaseModel.__pydantic_extra__.__set__,
+        "set_private": BaseModel.__pydantic_private__.__set__,
+    }
+    values = []
+    for i, (name, field) in enumerate(model.model_fields.items()):
+        value = f"row[{name!r}]"
+        enum_cls = _get_enum_cls(field.annotation)
+        if enum_cls:
+            namespace[f"enum_{i}"] = enum_cls
+            value = f"(None if {value} is None else enum_{i}({value}))"
+        values.append(f"{name!r}: {value}")
+
+    source = (
+        "def map_row(row):\n"
+        "    instance = model.__new__(model)\n"
+        f"    set_attr(instance, '__dict__', {{{', '.join(values)}}})\n"
+        "    set_fields_set(instance, fields_set)\n"
+        "    set_extra(instance, None)\n"
+        "    set_private(instance, None)\n"
+        "    return instance\n"
+    )
+    exec(source, namespace)
+    return namespace["map_row"]
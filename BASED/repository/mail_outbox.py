@@ -0,0 +1,128 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from BASED.repository.db import Database, observe_query, register_statement
+from BASED.repository.helpers import build_row_mapper
+
+
+class OutboxMessage(BaseModel):
+    id: int
+    recipients: list[str]
+    subject: str
+    text: str
+    attempts: int
+    created_timestamp: datetime
+
+
+outbox_message_from_row = build_row_mapper(OutboxMessage)
+
+ENQUEUE_SQL = register_statement(
+    """
+    insert into "mail_outbox" ("recipients", "subject", "text")
+    values ($1, $2, $3)
+    """
+)
+
+CLAIM_BATCH_SQL = register_statement(
+    """
+    update "mail_outbox"
+    set "attempts" = "attempts" + 1,
+        "next_attempt_timestamp" = (now() at time zone 'utc')
+         + make_interval(secs => $2)
+    where "id" in (
+        select "id" from "mail_outbox"
+        where "sent_timestamp" is null
+        and "next_attempt_timestamp" <= (now() at time zone 'utc')
+        and "attempts" < $3
+        order by "next_attempt_timestamp", "id"
+        limit $1
+        for update skip locked
+    )
+    returning *
+    """
+)
+
+MARK_SENT_SQL = register_statement(
+    """
+    update "mail_outbox"
+    set "sent_timestamp" = (now() at time zone 'utc'),
+        "last_error" = null
+    where "id" = any($1)
+    """
+)
+
+MARK_FAILED_SQL = register_statement(
+    """
+    update "mail_outbox"
+    set "next_attempt_timestamp" = (now() at time zone 'utc')
+         + make_interval(secs => $2),
+        "last_error" = $3
+    where "id" = $1
+    """
+)
+
+RELEASE_SQL = register_statement(
+    """
+    update "mail_outbox"
+    set "attempts" = "attempts" - 1,
+        "next_attempt_timestamp" = (now() at time zone 'utc')
+    where "id" = any($1)
+    and "sent_timestamp" is null
+    """
+)
+
+
+class MailOutboxRepository:
+    def __init__(self, db: Database) -> None:
+        self._db = db
+
+    @observe_query
+    async def enqueue(
+        self, messages: list[tuple[list[str], str, str]]
+    ) -> None:
+        """
+        Добавляет письма (получатели, тема, текст) в очередь отправки.
+        """
+        if not messages:
+            return
+
+        async with self._db.acquire() as c:
+            await c.executemany(ENQUEUE_SQL, messages)
+
+    @observe_query
+    async def claim_batch(
+        self, limit: int, lease_seconds: float, max_attempts: int
+    ) -> list[OutboxMessage]:
+        """
+        Забирает пачку писем, готовых к отправке. На lease_seconds
+        письма скрываются от других обработчиков: если отправитель
+        упадёт, они вернутся в очередь по истечении этого времени.
+        Письма, исчерпавшие max_attempts попыток, больше не забираются.
+        """
+        async with self._db.acquire() as c:
+            rows = await c.fetch(
+                CLAIM_BATCH_SQL, limit, lease_seconds, max_attempts
+            )
+
+        return [outbox_message_from_row(row) for row in rows]
+
+    @observe_query
+    async def mark_sent(self, ids: list[int]) -> None:
+        async with self._db.acquire() as c:
+            await c.execute(MARK_SENT_SQL, ids)
+
+    @observe_query
+    async def mark_failed(
+        self, id_: int, retry_seconds: float, error: str
+    ) -> None:
+        async with self._db.acquire() as c:
+            await c.execute(MARK_FAILED_SQL, id_, retry_seconds, error)
+
+    @observe_query
+    async def release(self, ids: list[int]) -> None:
+        """
+        Возвращает забранные, но не отправленные письма в очередь.
+        """
+        async with self._db.acquire() as c:
+            await c.execute(RELEASE_SQL, ids)
@@ -1,11 +1,18 @@
+import functools
+import logging
 from datetime import date, datetime
 from enum import IntEnum, StrEnum
-from typing import Optional
+from typing import AsyncIterator, Optional
 
-from asyncpg import Pool
 from pydantic import BaseModel
 
-from BASED.repository.helpers import build_model_sql
+from BASED.repository.db import Database, observe_query, register_statement
+from BASED.repository.graph import TaskGraph
+from BASED.repository.helpers import build_model_cls_sql, build_row_mapper
+from BASED.repository.user import User
+from BASED.repository.version import DataVersion
+
+logger = logging.getLogger(__name__)
 
 
 class TaskStatusEnum(StrEnum):
@@ -53,6 +60,9 @@ class Task(BaseModel):
     actual_completion_days: int | None
     is_archived: bool
     created_timestamp: datetime
+    cross_deadline: date | None
+    task_delay_caused_by: int | None
+    cross_finish_date: date | None
 
 
 class TaskDepends(BaseModel):
@@ -69,35 +79,303 @@ class TaskWithDependency(BaseModel):
     deadline: date
 
 
+class NeighbourTask(BaseModel):
+    dependency_type: DependencyTypeEnum
+    task: Task
+
+
+class TaskNeighbourhood(BaseModel):
+    task: Task
+    responsible: User | None
+    neighbours: list[NeighbourTask]
+
+
+class ActiveTaskRow(BaseModel):
+    task: Task
+    responsible: User | None
+
+
+task_from_row = build_row_mapper(Task)
+task_depends_from_row = build_row_mapper(TaskDepends)
+short_task_from_row = build_row_mapper(ShortTask)
+task_with_dependency_from_row = build_row_mapper(TaskWithDependency)
+
+CREATE_MODEL_SQL = build_model_cls_sql(TaskCreate)
+CREATE_SQL = register_statement(
+    f"""
+    insert into "task" ({CREATE_MODEL_SQL.field_names})
+    values ({CREATE_MODEL_SQL.placeholders})
+    returning *
+    """
+)
+
+GET_BY_ID_SQL = register_statement(
+    """
+    select * from "task"
+    where "id" = $1
+    """
+)
+
+UPDATE_TASK_DATA_SQL = register_statement(
+    """
+    update "task"
+    set "title" = $2, "description" = $3, "deadline" = $4,
+    "responsible_user_id" = $5, "days_for_completion" = $6
+    where "id" = $1
+    returning *
+    """
+)
+
+GET_GRAPH_NODES_SQL = register_statement(
+    """
+    select "task"."id",
+     array_remove(array_agg("task_depends"."depends_task_id"), null)
+      as "depends_ids"
+    from "task"
+    left join "task_depends" on "task_depends"."task_id" = "task"."id"
+    where "task"."id" = any($1)
+    group by "task"."id"
+    """
+)
+
+TRANSITION_STATUS_SQL = register_statement(
+    """
+    with "old" as (
+        select "id", "status",
+         case $2::varchar
+          when 'to_do' then null
+          when 'in_progress' then
+           case when "status" = 'to_do' then $3::date
+            else "actual_start_date" end
+          else "actual_start_date"
+         end as "start_date",
+         case $2::varchar
+          when 'done' then
+           case when "status" = 'done' then "actual_start_date"
+            else $3::date end
+         end as "finish_date"
+        from "task"
+        where "id" = $1
+        for update
+    ), "updated" as (
+        update "task"
+        set "status" = $2,
+            "actual_start_date" = "old"."start_date",
+            "actual_finish_date" = "old"."finish_date",
+            "actual_completion_days"
+             = "old"."finish_date" - "old"."start_date" + 1
+        from "old"
+        where "task"."id" = "old"."id"
+        and not ("old"."status" = 'to_do' and $2::varchar = 'done')
+        returning "task".*
+    )
+    select "old"."status" as "old_status", "updated".*
+    from "old" left join "updated" on true
+    """
+)
+
+GET_TASK_DEPENDS_SQL = register_statement(
+    """
+    SELECT * from "task_depends"
+    WHERE "task_id" = $1
+    """
+)
+
+GET_TASKS_DEPENDENT_OF_SQL = register_statement(
+    """
+    SELECT * from "task_depends"
+    WHERE "depends_task_id" = $1
+    """
+)
+
+ADD_TASK_DEPENDS_SQL = register_statement(
+    """
+    INSERT INTO "task_depends" (task_id, depends_task_id)
+    VALUES ($1, $2)
+    ON CONFLICT (task_id, depends_task_id) DO NOTHING
+    """
+)
+
+UPDATE_TASK_ARCHIVE_STATUS_SQL = register_statement(
+    """
+    update "task"
+    set "is_archived" = $2
+    where "id" = $1
+    returning 1
+    """
+)
+
+UPDATE_TASK_DEADLINE_SQL = register_statement(
+    """
+    update "task"
+    set "deadline" = $2
+    where "id" = $1
+    returning 1
+    """
+)
+
+GET_SHORT_TASKS_PAGE_SQL = register_statement(
+    """
+    select "id", "title"
+    from "task"
+    where not "is_archived" and "id" > $1
+    order by "id"
+    limit $2
+    """
+)
+
+GET_TASKS_ORDERED_BY_DEADLINE_SQL = register_statement(
+    """
+    select * from "task"
+    where not "is_archived"
+    order by "deadline"
+    """
+)
+
+DEL_TASKS_DEPENDS_SQL = register_statement(
+    """
+    DELETE FROM "task_depends"
+    WHERE "task_id" = $1 AND "depends_task_id" = $2
+    RETURNING TRUE
+    """
+)
+
+GET_ALL_TASK_DEPENDENCIES_SQL = register_statement(
+    """
+    select "id", 'depends_of' as "dependency_type",
+     "title", "deadline", "responsible_user_id"
+    from "task_depends" join "task"
+    on "task_depends"."task_id" = "task"."id"
+    where "depends_task_id" = $1
+    union
+    select "id", 'dependent_for' as "dependency_type",
+     "title", "deadline", "responsible_user_id"
+    from "task_depends" join "task"
+    on "task_depends"."depends_task_id" = "task"."id"
+    where "task_id" = $1
+    union
+    select "id", 'self' as "dependency_type",
+     "title", "deadline", "responsible_user_id"
+    from "task"
+    where "id" = $1
+    order by "deadline"
+    """
+)
+
+GET_TASK_NEIGHBOURHOOD_SQL = register_statement(
+    """
+    with "neighbour" as (
+        select "depends_task_id" as "id", 1 as "ord",
+         'dependent_for' as "dependency_type"
+        from "task_depends"
+        where "task_id" = $1
+        union all
+        select "task_id" as "id", 2 as "ord",
+         'depends_of' as "dependency_type"
+        from "task_depends"
+        where "depends_task_id" = $1
+    )
+    select
+        to_jsonb("task") as "task",
+        case when "user"."id" is null then null
+         else to_jsonb("user") end as "responsible",
+        coalesce((
+            select jsonb_agg(jsonb_build_object(
+                'dependency_type', "neighbour"."dependency_type",
+                'task', to_jsonb("neighbour_task")
+            ) order by "neighbour"."ord", "neighbour"."id")
+            from "neighbour" join "task" as "neighbour_task"
+            on "neighbour_task"."id" = "neighbour"."id"
+        ), '[]'::jsonb) as "neighbours"
+    from "task" left join "user"
+    on "user"."id" = "task"."responsible_user_id"
+    where "task"."id" = $1
+    """
+)
+
+DEL_RESPONSIBLE_USER_ID_SQL = register_statement(
+    """
+    update "task"
+    set "responsible_user_id" = NULL
+    where "responsible_user_id" = $1
+    returning 1
+    """
+)
+
+
 class TaskRepository:
-    def __init__(self, db: Pool):
+    def __init__(self, db: Database, graph: TaskGraph, version: DataVersion):
         self._db = db
+        self._graph = graph
+        self._version = version
 
-    async def create(self, task_create_model: TaskCreate) -> Task:
-        model_build = build_model_sql(task_create_model)
-        sql = f"""
-            insert into "task" ({model_build.field_names})
-            values ({model_build.placeholders})
-            returning *
+    @observe_query
+    async def load_graph(self) -> None:
+        """
+        Загружает граф зависимостей задач в память.
+        """
+        tasks_sql = """
+            select "id" from "task"
+        """
+        depends_sql = """
+            select "task_id", "depends_task_id" from "task_depends"
         """
         async with self._db.acquire() as c:
-            row = await c.fetchrow(sql, *model_build.values)
+            task_rows = await c.fetch(tasks_sql)
+            depends_rows = await c.fetch(depends_sql)
 
-        return Task(**dict(row))
+        self._graph.load(
+            task_ids=[row["id"] for row in task_rows],
+            edges=[
+                (row["task_id"], row["depends_task_id"])
+                for row in depends_rows
+            ],
+        )
 
-    async def get_by_id(self, id_: int) -> Optional[Task]:
-        sql = """
-            select * from "task"
-            where "id" = $1
+    @observe_query
+    async def refresh_graph(self, task_ids: list[int]) -> None:
+        """
+        Перечитывает задачи task_ids и их зависимости в граф в памяти
+        после изменений, сделанных другими процессами.
         """
         async with self._db.acquire() as c:
-            row = await c.fetchrow(sql, id_)
+            rows = await c.fetch(GET_GRAPH_NODES_SQL, task_ids)
+
+        def update_graph():
+            for row in rows:
+                self._graph.add_node(row["id"])
+                self._graph.set_depends_of(row["id"], set(row["depends_ids"]))
+
+        self._db.after_commit(update_graph)
+
+    @observe_query
+    async def create(self, task_create_model: TaskCreate) -> Task:
+        async with self._db.acquire() as c:
+            row = await c.fetchrow(
+                CREATE_SQL,
+                *(
+                    getattr(task_create_model, name)
+                    for name in TaskCreate.model_fields
+                ),
+            )
+
+        self._version.bump()
+        self._db.after_commit(
+            functools.partial(self._graph.add_node, row["id"])
+        )
+        return task_from_row(row)
+
+    @observe_query
+    async def get_by_id(self, id_: int) -> Optional[Task]:
+        async with self._db.acquire() as c:
+            row = await c.fetchrow(GET_BY_ID_SQL, id_)
 
         if not row:
             return
 
-        return Task(**dict(row))
+        return task_from_row(row)
 
+    @observe_query
     async def update_task_data(
         self,
         task_id: int,
@@ -110,16 +388,9 @@ class TaskRepository:
         """
         Обновляет основные данные о задаче.
         """
-        sql = """
-            update "task"
-            set "title" = $2, "description" = $3, "deadline" = $4,
-            "responsible_user_id" = $5, "days_for_completion" = $6
-            where "id" = $1
-            returning *
-        """
         async with self._db.acquire() as c:
             row = await c.fetchrow(
-                sql,
+                UPDATE_TASK_DATA_SQL,
                 task_id,
                 title,
                 description,
@@ -128,220 +399,333 @@ class TaskRepository:
                 days_for_completion,
             )
 
+        self._version.bump()
+
         if not row:
             return
 
-        return Task(**dict(row))
+        return task_from_row(row)
 
-    async def update_task_status(
-        self, task_id: int, new_status: TaskStatusEnum
-    ) -> Optional[Task]:
+    @observe_query
+    async def transition_status(
+        self, task_id: int, new_status: TaskStatusEnum, as_of: date
+    ) -> Optional[tuple[TaskStatusEnum, Optional[Task]]]:
         """
-        Изменяет статус задачи.
-        """
-        sql = """
-            update "task" set "status" = $2
-            where "id" = $1
-            returning *
+        Переводит задачу в новый статус одним запросом: проверка
+        перехода, смена статуса и фактических дат выполняются под
+        блокировкой строки задачи. Дата начала или окончания
+        выставляется в as_of.
+        Возвращает предыдущий статус и обновлённую задачу; задача равна
+        None, если переход запрещён (из to_do сразу в done).
+        Возвращает None, если задача не найдена.
         """
         async with self._db.acquire() as c:
-            row = await c.fetchrow(sql, task_id, new_status)
+            row = await c.fetchrow(
+                TRANSITION_STATUS_SQL, task_id, new_status, as_of
+            )
 
         if not row:
             return
 
-        return Task(**dict(row))
-
-    async def update_task_start_finish_dates(
-        self,
-        task_id: int,
-        new_start_date: date | None,
-        new_finish_date: date | None,
-    ) -> bool:
-        """
-        Обновляет фактическую дату начала и фактическую дату окончания
-        в соответсвуии с переданными значениями.
-        Возвращает True в случае успеха, False если задача не найдена.
-        """
-        actual_completion_days = None
-        if new_start_date is not None and new_finish_date is not None:
-            actual_completion_days = (
-                new_finish_date - new_start_date
-            ).days + 1
-
-        sql = """
-            update "task"
-            set "actual_start_date" = $2,
-                "actual_finish_date" = $3,
-                "actual_completion_days" = $4
-            where "id" = $1
-            returning 1
-        """
-        async with self._db.acquire() as c:
-            row = await c.fetchrow(
-                sql,
-                task_id,
-                new_start_date,
-                new_finish_date,
-                actual_completion_days,
-            )
+        old_status = TaskStatusEnum(row["old_status"])
+        if row["id"] is None:
+            return old_status, None
 
-        return bool(row)
+        self._version.bump()
+        return old_status, task_from_row(row)
 
+    @observe_query
     async def get_task_depends(self, id_: int) -> list[TaskDepends] | None:
         """
         Показывает зависимости задачи
         """
-        sql = """
-        SELECT * from "task_depends"
-        WHERE "task_id" = $1
-        """
         async with self._db.acquire() as c:
-            data = await c.fetch(sql, id_)
+            data = await c.fetch(GET_TASK_DEPENDS_SQL, id_)
 
-        return [TaskDepends(**dict(row)) for row in data]
+        return [task_depends_from_row(row) for row in data]
 
+    @observe_query
     async def get_tasks_dependent_of(
         self, dependent_task_id: int
     ) -> list[TaskDepends]:
         """
         Получение всех задач, от которых зависит данная.
         """
-        sql = """
-                SELECT * from "task_depends"
-                WHERE "depends_task_id" = $1
-                """
         async with self._db.acquire() as c:
-            rows = await c.fetch(sql, dependent_task_id)
+            rows = await c.fetch(GET_TASKS_DEPENDENT_OF_SQL, dependent_task_id)
 
-        return [TaskDepends(**dict(row)) for row in rows]
+        return [task_depends_from_row(row) for row in rows]
 
+    @observe_query
     async def add_task_depends(self, id_: int, depends_id: int) -> None:
         """
         Добавляет зависимость задач
         """
-        sql = """
-        INSERT INTO "task_depends" (task_id, depends_task_id)
-        VALUES ($1, $2)
-        ON CONFLICT (task_id, depends_task_id) DO NOTHING
-        """
         async with self._db.acquire() as c:
-            await c.execute(sql, id_, depends_id)
+            await c.execute(ADD_TASK_DEPENDS_SQL, id_, depends_id)
+
+        self._version.bump()
+        self._db.after_commit(
+            functools.partial(self._graph.add_edge, id_, depends_id)
+        )
+
+    @observe_query
+    async def add_task_depends_batch(
+        self, depends: list[tuple[int, int]]
+    ) -> list[int]:
+        """
+        Проверяет и добавляет пачку зависимостей (task_id, depends_task_id)
+        в одной транзакции.
+        Зависимость отклоняется, если одной из задач не существует,
+        задача ссылается сама на себя или зависимость замыкает цикл
+        с уже существующими либо с принятыми ранее зависимостями пачки.
+        Под блокировкой зависимостей одним запросом загружаются все
+        зависимости, достижимые из задач пачки, и циклы проверяются
+        в памяти.
+        Возвращает позиции отклонённых зависимостей в depends.
+        """
+        lock_sql = """
+            lock table "task_depends" in share row exclusive mode
+        """
+        exist_sql = """
+            select "id" from "task"
+            where "id" = any($1)
+        """
+        reachable_edges_sql = """
+            with recursive "reach" as (
+                select unnest($1::int[]) as "node"
+                union
+                select "task_depends"."depends_task_id"
+                from "reach" join "task_depends"
+                on "task_depends"."task_id" = "reach"."node"
+            )
+            select "task_depends"."task_id", "task_depends"."depends_task_id"
+            from "reach" join "task_depends"
+            on "task_depends"."task_id" = "reach"."node"
+        """
+        insert_sql = """
+            insert into "task_depends" ("task_id", "depends_task_id")
+            select * from unnest($1::int[], $2::int[])
+            on conflict ("task_id", "depends_task_id") do nothing
+        """
+        if not depends:
+            return []
 
+        task_ids = list({task_id for edge in depends for task_id in edge})
+        rejected = []
+        accepted = []
+        async with self._db.acquire() as c:
+            async with c.transaction():
+                await c.execute(lock_sql)
+                rows = await c.fetch(exist_sql, task_ids)
+                existing_ids = [row["id"] for row in rows]
+                rows = await c.fetch(reachable_edges_sql, existing_ids)
+                graph = TaskGraph()
+                graph.load(
+                    existing_ids,
+                    [(row["task_id"], row["depends_task_id"]) for row in rows],
+                )
+
+                for position, (task_id, depends_task_id) in enumerate(depends):
+                    if not (
+                        graph.has_node(task_id)
+                        and graph.has_node(depends_task_id)
+                    ):
+                        logger.error(
+                            "Task not found. task_id=%s depends_task_id=%s",
+                            task_id,
+                            depends_task_id,
+                        )
+                        rejected.append(position)
+                    elif task_id == depends_task_id:
+                        logger.error(
+                            "Сannot refer to itself. task_id=%s", task_id
+                        )
+                        rejected.append(position)
+                    elif graph.creates_cycle(task_id, depends_task_id):
+                        logger.error(
+                            "Depend creating cycle."
+                            " task_id=%s depends_task_id=%s",
+                            task_id,
+                            depends_task_id,
+                        )
+                        rejected.append(position)
+                    else:
+                        graph.add_edge(task_id, depends_task_id)
+                        accepted.append((task_id, depends_task_id))
+
+                if accepted:
+                    await c.execute(
+                        insert_sql,
+                        [edge[0] for edge in accepted],
+                        [edge[1] for edge in accepted],
+                    )
+
+        def update_graph():
+            for task_id, depends_task_id in accepted:
+                self._graph.add_edge(task_id, depends_task_id)
+
+        self._version.bump()
+        self._db.after_commit(update_graph)
+
+        return rejected
+
+    @observe_query
     async def update_task_archive_status(
         self, task_id: int, archive_status: bool
     ) -> bool:
         """
         Изменяет статус архивации для задачи.
         """
-        sql = """
-            update "task"
-            set "is_archived" = $2
-            where "id" = $1
-            returning 1
-        """
         async with self._db.acquire() as c:
-            row = await c.fetchrow(sql, task_id, archive_status)
+            row = await c.fetchrow(
+                UPDATE_TASK_ARCHIVE_STATUS_SQL, task_id, archive_status
+            )
+
+        self._version.bump()
 
         return bool(row)
 
+    @observe_query
     async def update_task_deadline(
         self, task_id: int, new_deadline: date
     ) -> bool:
         """
         Изменяет текущий дедлайн по задаче.
         """
-        sql = """
-            update "task"
-            set "deadline" = $2
-            where "id" = $1
-            returning 1
-        """
         async with self._db.acquire() as c:
-            row = await c.fetchrow(sql, task_id, new_deadline)
+            row = await c.fetchrow(
+                UPDATE_TASK_DEADLINE_SQL, task_id, new_deadline
+            )
+
+        self._version.bump()
 
         return bool(row)
 
-    async def get_all_short_tasks(self) -> list[ShortTask]:
-        """
-        Получает всех пользователей.
+    @observe_query
+    async def get_short_tasks_page(
+        self, limit: int, after_id: int | None = None
+    ) -> list[ShortTask]:
         """
-        sql = """
-            SELECT *
-            FROM "task"
+        Получает страницу активных задач с id больше after_id.
         """
         async with self._db.acquire() as c:
-            data = await c.fetch(sql)
+            data = await c.fetch(
+                GET_SHORT_TASKS_PAGE_SQL, after_id or 0, limit
+            )
 
-        return [ShortTask(**dict(i)) for i in data]
+        return [short_task_from_row(i) for i in data]
 
+    @observe_query
     async def get_tasks_ordered_by_deadline(self) -> list[Task]:
         """
         Получает задачи отсортированные по дедлайнам и статусам.
         """
+        async with self._db.acquire() as c:
+            rows = await c.fetch(GET_TASKS_ORDERED_BY_DEADLINE_SQL)
+
+        return [task_from_row(row) for row in rows]
+
+    @observe_query
+    async def iter_tasks(self, chunk_size: int) -> AsyncIterator[list[Task]]:
+        """
+        Читает все задачи серверным курсором и отдаёт их пачками.
+        """
         sql = """
             select * from "task"
-            where not "is_archived"
-            order by "deadline"
+            order by "id"
         """
         async with self._db.acquire() as c:
-            rows = await c.fetch(sql)
-
-        return [Task(**dict(row)) for row in rows]
-
+            async with c.transaction():
+                chunk = []
+                async for row in c.cursor(sql, prefetch=chunk_size):
+                    chunk.append(task_from_row(row))
+                    if len(chunk) == chunk_size:
+                        yield chunk
+                        chunk = []
+                if chunk:
+                    yield chunk
+
+    @observe_query
+    async def iter_active_tasks_with_relations(
+        self, chunk_size: int
+    ) -> AsyncIterator[list[ActiveTaskRow]]:
+        """
+        Читает активные задачи, отсортированные по дедлайну, вместе
+        с ответственным. Данные читаются серверным курсором и отдаются
+        пачками.
+        """
+        sql = """
+            select
+                to_jsonb("task") as "task",
+                case when "user"."id" is null then null
+                 else to_jsonb("user") end as "responsible"
+            from "task"
+            left join "user" on "user"."id" = "task"."responsible_user_id"
+            where not "task"."is_archived"
+            order by "task"."deadline"
+        """
+        async with self._db.acquire() as c:
+            async with c.transaction():
+                chunk = []
+                async for row in c.cursor(sql, prefetch=chunk_size):
+                    chunk.append(ActiveTaskRow(**dict(row)))
+                    if len(chunk) == chunk_size:
+                        yield chunk
+                        chunk = []
+                if chunk:
+                    yield chunk
+
+    @observe_query
     async def del_tasks_depends(self, id_: int, depends_id: int) -> bool:
         """
         Получает всех пользователей.
         """
-        sql = """
-            DELETE FROM "task_depends"
-            WHERE "task_id" = $1 AND "depends_task_id" = $2
-            RETURNING TRUE
-        """
         async with self._db.acquire() as c:
-            row = await c.fetchrow(sql, id_, depends_id)
+            row = await c.fetchrow(DEL_TASKS_DEPENDS_SQL, id_, depends_id)
+
+        self._version.bump()
+
         if not row:
             return False
+        self._db.after_commit(
+            functools.partial(self._graph.remove_edge, id_, depends_id)
+        )
         return True
 
+    @observe_query
     async def get_all_task_dependencies(
         self, task_id: int
     ) -> list[TaskWithDependency]:
-        sql = """
-            select "id", 'depends_of' as "dependency_type",
-             "title", "deadline", "responsible_user_id"
-            from "task_depends" join "task"
-            on "task_depends"."task_id" = "task"."id"
-            where "depends_task_id" = $1
-            union
-            select "id", 'dependent_for' as "dependency_type",
-             "title", "deadline", "responsible_user_id"
-            from "task_depends" join "task"
-            on "task_depends"."depends_task_id" = "task"."id"
-            where "task_id" = $1
-            union
-            select "id", 'self' as "dependency_type",
-             "title", "deadline", "responsible_user_id"
-            from "task"
-            where "id" = $1
-            order by "deadline"
+        async with self._db.acquire() as c:
+            rows = await c.fetch(GET_ALL_TASK_DEPENDENCIES_SQL, task_id)
+
+        return [task_with_dependency_from_row(row) for row in rows]
+
+    @observe_query
+    async def get_task_neighbourhood(
+        self, task_id: int
+    ) -> Optional[TaskNeighbourhood]:
+        """
+        Получает одним запросом задачу, её ответственного и все соседние
+        по зависимостям задачи.
         """
         async with self._db.acquire() as c:
-            rows = await c.fetch(sql, task_id)
+            row = await c.fetchrow(GET_TASK_NEIGHBOURHOOD_SQL, task_id)
+
+        if not row:
+            return
 
-        return [TaskWithDependency(**dict(row)) for row in rows]
+        return TaskNeighbourhood(**dict(row))
 
+    @observe_query
     async def del_responsible_user_id(self, user_id: int) -> bool:
         """
         Удаляет ответственного
         """
-        sql = """
-               update "task"
-               set "responsible_user_id" = NULL
-               where "responsible_user_id" = $1
-               returning 1
-           """
         async with self._db.acquire() as c:
-            row = await c.fetchrow(sql, user_id)
+            row = await c.fetchrow(DEL_RESPONSIBLE_USER_ID_SQL, user_id)
+
+        self._version.bump()
 
         return bool(row)
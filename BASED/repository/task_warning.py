@@ -0,0 +1,219 @@
+from datetime import date
+from typing import Callable, Optional
+
+from pydantic import BaseModel
+
+from BASED.repository.db import Database, observe_query, register_statement
+from BASED.repository.helpers import build_row_mapper
+from BASED.repository.mail_outbox import ENQUEUE_SQL
+from BASED.repository.task import Task, task_from_row
+
+
+class TaskWarning(BaseModel):
+    task_id: int
+    position: int
+    type: str
+    warning_task_id: int
+
+
+class RaisedWarning(BaseModel):
+    task_id: int
+    type: str
+    warning_task_id: int
+    title: Optional[str]
+    responsible_user_id: Optional[int]
+    email: Optional[str]
+
+
+REBUILD_LOCK_ID = 1001
+
+task_warning_from_row = build_row_mapper(TaskWarning)
+raised_warning_from_row = build_row_mapper(RaisedWarning)
+
+GET_WARNINGS_SQL = register_statement(
+    """
+    select "task_warning".*
+    from "task_warning_snapshot"
+    left join "task_warning"
+    on "task_warning"."as_of" = "task_warning_snapshot"."as_of"
+    and ($2::int[] is null or "task_warning"."task_id" = any($2))
+    where "task_warning_snapshot"."as_of" = $1
+    order by "task_warning"."task_id", "task_warning"."position"
+    """
+)
+
+
+class TaskWarningRepository:
+    def __init__(self, db: Database):
+        self._db = db
+
+    @observe_query
+    async def get_warnings(
+        self, as_of: date, task_ids: list[int] | None = None
+    ) -> Optional[list[TaskWarning]]:
+        """
+        Получает предупреждения из снимка на дату as_of.
+        Возвращает None, если актуального снимка нет.
+        """
+        async with self._db.acquire() as c:
+            rows = await c.fetch(GET_WARNINGS_SQL, as_of, task_ids)
+
+        if not rows:
+            return
+
+        return [
+            task_warning_from_row(row)
+            for row in rows
+            if row["task_id"] is not None
+        ]
+
+    @observe_query
+    async def rebuild_snapshot(
+        self,
+        as_of: date,
+        compute: Callable[[list[Task]], list[TaskWarning]],
+        notify_types: list[str] | None = None,
+        notify: Optional[
+            Callable[[list[RaisedWarning]], list[tuple[list[str], str, str]]]
+        ] = None,
+    ) -> Optional[int]:
+        """
+        Пересчитывает снимок предупреждений на дату as_of.
+        Пересчёты разных процессов выполняются по очереди
+        (advisory lock), актуальный снимок на as_of не пересчитывается.
+        Запись в задачи и зависимости блокируется только на время
+        постановки метки пересчёта и записи результата, в том же порядке
+        таблиц, что и при записи зависимостей (task_depends, затем task).
+        Задачи читаются в REPEATABLE READ (внутри уже открытой транзакции
+        соединения - в её уровне изоляции), предупреждения считаются
+        вне транзакции.
+        Любая запись удаляет метку и снимок триггером, поэтому результат
+        сохраняется, только если метка пережила пересчёт.
+        Если передан notify, снимок сравнивается с уже отправленными
+        предупреждениями типов notify_types: notify получает только
+        новые предупреждения, а возвращённые им письма ставятся
+        в очередь в той же транзакции.
+        Возвращает количество предупреждений или None, если снимок
+        уже актуален либо данные изменились во время пересчёта
+        (тогда пересчёт будет запрошен изменившим их процессом).
+        """
+        advisory_lock_sql = """
+            select pg_advisory_lock($1)
+        """
+        advisory_unlock_sql = """
+            select pg_advisory_unlock($1)
+        """
+        lock_sql = """
+            lock table "task_depends", "task" in share mode
+        """
+        snapshot_exists_sql = """
+            select exists(
+                select from "task_warning_snapshot" where "as_of" = $1
+            )
+        """
+        insert_marker_sql = """
+            insert into "task_warning_rebuild" default values
+            returning "id"
+        """
+        delete_marker_sql = """
+            delete from "task_warning_rebuild"
+            where "id" = $1
+            returning true
+        """
+        tasks_sql = """
+            select * from "task"
+            where not "is_archived"
+        """
+        delete_warnings_sql = """
+            delete from "task_warning"
+        """
+        delete_snapshots_sql = """
+            delete from "task_warning_snapshot"
+        """
+        insert_warnings_sql = """
+            insert into "task_warning" (
+                "as_of", "task_id", "position", "type", "warning_task_id"
+            )
+            select $1, *
+            from unnest($2::int[], $3::int[], $4::varchar[], $5::int[])
+        """
+        insert_snapshot_sql = """
+            insert into "task_warning_snapshot" ("as_of")
+            values ($1)
+        """
+        diff_notified_sql = """
+            with "current" as (
+                select distinct "task_id", "type", "warning_task_id"
+                from "task_warning"
+                where "as_of" = $1 and "type" = any($2::varchar[])
+            ), "resolved" as (
+                delete from "task_warning_notified"
+                where ("task_id", "type", "warning_task_id")
+                 not in (select * from "current")
+            ), "raised" as (
+                insert into "task_warning_notified" (
+                    "task_id", "type", "warning_task_id"
+                )
+                select * from "current"
+                on conflict do nothing
+                returning "task_id", "type", "warning_task_id"
+            )
+            select "raised".*, "task"."title", "task"."responsible_user_id",
+             "user"."email"
+            from "raised"
+            join "task" on "task"."id" = "raised"."task_id"
+            left join "user" on "user"."id" = "task"."responsible_user_id"
+            order by "raised"."task_id", "raised"."type"
+        """
+        async with self._db.acquire() as c:
+            await c.execute(advisory_lock_sql, REBUILD_LOCK_ID)
+            try:
+                async with c.transaction():
+                    await c.execute(lock_sql)
+                    if await c.fetchval(snapshot_exists_sql, as_of):
+                        return
+
+                    marker_id = await c.fetchval(insert_marker_sql)
+
+                snapshot_options = (
+                    {}
+                    if c.is_in_transaction()
+                    else {"isolation": "repeatable_read", "readonly": True}
+                )
+                async with c.transaction(**snapshot_options):
+                    task_rows = await c.fetch(tasks_sql)
+                warnings = compute([task_from_row(row) for row in task_rows])
+
+                async with c.transaction():
+                    await c.execute(lock_sql)
+                    if not await c.fetchval(delete_marker_sql, marker_id):
+                        return
+
+                    await c.execute(delete_warnings_sql)
+                    await c.execute(delete_snapshots_sql)
+                    await c.execute(
+                        insert_warnings_sql,
+                        as_of,
+                        [warning.task_id for warning in warnings],
+                        [warning.position for warning in warnings],
+                        [warning.type for warning in warnings],
+                        [warning.warning_task_id for warning in warnings],
+                    )
+                    await c.execute(insert_snapshot_sql, as_of)
+
+                    if notify:
+                        raised_rows = await c.fetch(
+                            diff_notified_sql, as_of, notify_types
+                        )
+                        messages = notify(
+                            [
+                                raised_warning_from_row(row)
+                                for row in raised_rows
+                            ]
+                        )
+                        if messages:
+                            await c.executemany(ENQUEUE_SQL, messages)
+            finally:
+                await c.execute(advisory_unlock_sql, REBUILD_LOCK_ID)
+
+        return len(warnings)
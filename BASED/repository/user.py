@@ -1,67 +1,117 @@
 from typing import Optional
 
-from asyncpg import Pool
 from pydantic import BaseModel
 
+from BASED.repository.db import Database, observe_query, register_statement
+from BASED.repository.helpers import build_row_mapper
+from BASED.repository.version import DataVersion
+
 
 class User(BaseModel):
     id: int
     name: str
 
 
+user_from_row = build_row_mapper(User)
+
+
+CREATE_USER_SQL = register_statement(
+    """
+    INSERT INTO "user" (name, email)
+    VALUES ($1, $2)
+    """
+)
+
+GET_USERS_PAGE_SQL = register_statement(
+    """
+    select "id", "name"
+    from "user"
+    where "id" > $1
+    order by "id"
+    limit $2
+    """
+)
+
+GET_BY_ID_SQL = register_statement(
+    """
+    select * from "user"
+    where "id" = $1
+    """
+)
+
+GET_BY_IDS_SQL = register_statement(
+    """
+    select * from "user"
+    where "id" = any($1)
+    """
+)
+
+DEL_USER_SQL = register_statement(
+    """
+    DELETE FROM "user"
+    WHERE "id" = $1
+    RETURNING TRUE
+    """
+)
+
+
 class UserRepository:
-    def __init__(self, db: Pool):
+    def __init__(self, db: Database, version: DataVersion):
         self._db = db
+        self._version = version
 
-    async def create_user(self, name):
+    @observe_query
+    async def create_user(self, name, email=None):
         """
         Создаёт пользователя.
         """
-        sql = """
-        INSERT INTO "user" (name)
-        VALUES ($1)
-        """
         async with self._db.acquire() as c:
-            await c.fetchrow(sql, name)
+            await c.fetchrow(CREATE_USER_SQL, name, email)
+
+        self._version.bump()
         return
 
-    async def get_users(self) -> list[User]:
-        """
-        Получает всех пользователей.
+    @observe_query
+    async def get_users_page(
+        self, limit: int, after_id: int | None = None
+    ) -> list[User]:
         """
-        sql = """
-            SELECT *
-            FROM "user"
+        Получает страницу пользователей с id больше after_id.
         """
         async with self._db.acquire() as c:
-            data = await c.fetch(sql)
+            data = await c.fetch(GET_USERS_PAGE_SQL, after_id or 0, limit)
 
-        return [User(**dict(i)) for i in data]
+        return [user_from_row(i) for i in data]
 
+    @observe_query
     async def get_by_id(self, id_: int) -> Optional[User]:
-        sql = """
-            select * from "user"
-            where "id" = $1
-        """
         async with self._db.acquire() as c:
-            row = await c.fetchrow(sql, id_)
+            row = await c.fetchrow(GET_BY_ID_SQL, id_)
 
         if not row:
             return
 
-        return User(**dict(row))
+        return user_from_row(row)
+
+    @observe_query
+    async def get_by_ids(self, ids: list[int]) -> list[User]:
+        """
+        Получает пользователей по списку идентификаторов.
+        """
+        async with self._db.acquire() as c:
+            rows = await c.fetch(GET_BY_IDS_SQL, ids)
+
+        return [user_from_row(row) for row in rows]
 
+    @observe_query
     async def del_user(self, user_id: int) -> bool:
         """
         Удаление пользователя.
         """
-        sql = """
-            DELETE FROM "user"
-            WHERE "id" = $1
-            RETURNING TRUE
-        """
         async with self._db.acquire() as c:
-            row = await c.fetchrow(sql, user_id)
+            row = await c.fetchrow(DEL_USER_SQL, user_id)
+
+        self._version.bump()
         if not row:
             return False
         return True
@@ -2,13 +2,14 @@ import json
 import logging
 from enum import StrEnum
 
-from asyncpg import Pool
 from asyncpg.exceptions import (
     IntegrityConstraintViolationError as ConstraintError,
 )
 from pydantic import BaseModel, computed_field
 
 from BASED.helpers import assert_never
+from BASED.repository.db import Database, observe_query, register_statement
+from BASED.repository.helpers import build_row_mapper
 
 logger = logging.getLogger(__name__)
 
@@ -48,10 +49,22 @@ class Variable(BaseModel):
         return parsed_value
 
 
+variable_from_row = build_row_mapper(Variable)
+
+GET_VARIABLE_SQL = register_statement(
+    """
+    SELECT *
+    FROM "variable"
+    WHERE "name" = $1
+    """
+)
+
+
 class VariableRepository:
-    def __init__(self, db: Pool) -> None:
+    def __init__(self, db: Database) -> None:
         self._db = db
 
+    @observe_query
     async def init_variables(self, variable_list: list[Variable]):
         """
         Инициализирует переменные в базе (если они еще не созданы)
@@ -86,21 +99,17 @@ class VariableRepository:
         if not row:
             return
 
-        return Variable(**dict(row))
+        return variable_from_row(row)
 
+    @observe_query
     async def get_variable(self, name: str) -> Variable | None:
         """
         Получает значение переменной по имени
         """
-        sql = """
-            SELECT *
-            FROM "variable"
-            WHERE "name" = $1
-        """
         async with self._db.acquire() as c:
-            row = await c.fetchrow(sql, name)
+            row = await c.fetchrow(GET_VARIABLE_SQL, name)
 
         if not row:
             return
 
-        return Variable(**dict(row))
+        return variable_from_row(row)
@@ -0,0 +1,68 @@
+from typing import Callable
+from uuid import uuid4
+
+from BASED.repository.db import Database, observe_query, register_statement
+
+GET_DATA_VERSION_SQL = register_statement(
+    """
+    select "value" from "data_version"
+    """
+)
+
+
+class DataVersion:
+    """
+    Версия данных проекта. Увеличивается после каждой записи в базу,
+    по ней инвалидируются закэшированные ответы.
+    Эпоха меняется при каждом запуске, чтобы версии разных запусков
+    не совпадали.
+    """
+
+    def __init__(self) -> None:
+        self._epoch = uuid4().hex[:12]
+        self._value = 0
+        self._subscribers: list[Callable[[], None]] = []
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    @property
+    def epoch(self) -> str:
+        return self._epoch
+
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        """
+        Добавляет обработчик, вызываемый после каждого изменения данных.
+        """
+        self._subscribers.append(callback)
+
+    def bump(self, notify_subscribers: bool = True) -> None:
+        """
+        Увеличивает версию. Изменения, сделанные другими процессами,
+        отмечаются без вызова обработчиков: они уже вызваны там.
+        """
+        self._value += 1
+        if not notify_subscribers:
+            return
+
+        for callback in self._subscribers:
+            callback()
+
+
+class DataVersionRepository:
+    """
+    Версия данных в базе. Увеличивается триггерами при фиксации
+    каждой транзакции, изменившей задачи, зависимости или
+    пользователей, поэтому одинакова для всех процессов.
+    """
+
+    def __init__(self, db: Database) -> None:
+        self._db = db
+
+    @observe_query
+    async def get_value(self) -> int:
+        async with self._db.acquire() as c:
+            value = await c.fetchval(GET_DATA_VERSION_SQL)
+
+        return value
@@ -0,0 +1,72 @@
+"""
+Запуск в продакшене. Миграции применяются один раз до запуска
+воркеров, затем запускается TL_WORKERS процессов uvicorn на uvloop
+и httptools. Воркеры пишут метрики в файлы PROMETHEUS_MULTIPROC_DIR,
+основной процесс отдаёт их суммой на TL_PROMETHEUS_PORT:
+
+    python -m BASED.serve
+"""
+
+import logging
+import os
+import shutil
+
+import uvicorn
+from prometheus_client import (
+    CollectorRegistry,
+    multiprocess,
+    start_http_server,
+)
+
+import BASED.conf as conf
+import BASED.migrations_runner as migrations_runner
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MULTIPROC_DIR = "/tmp/based_prometheus"
+
+
+def prepare_multiproc_dir() -> str:
+    """
+    Очищает каталог метрик от файлов предыдущего запуска.
+    Переменная окружения наследуется воркерами, поэтому основной
+    процесс не должен создавать метрики до её установки.
+    """
+    path = conf.PROMETHEUS_MULTIPROC_DIR or DEFAULT_MULTIPROC_DIR
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    return path
+
+
+def expose_prometheus(path: str) -> None:
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=path)
+    start_http_server(port=conf.PROMETHEUS_PORT, registry=registry)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    path = prepare_multiproc_dir()
+    if conf.APPLY_MIGRATIONS:
+        logger.info("Applying migrations")
+        migrations_runner.apply()
+    if conf.PROMETHEUS_EXPOSE:
+        expose_prometheus(path)
+
+    os.environ["TL_APPLY_MIGRATIONS"] = "false"
+    os.environ["TL_PROMETHEUS_EXPOSE"] = "false"
+    logger.info("Starting workers. count=%s", conf.WORKERS)
+    uvicorn.run(
+        app="BASED.app:app",
+        host="0.0.0.0",
+        port=8080,
+        workers=conf.WORKERS,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,20 @@
-import json
-
-from asyncpg import Pool, create_pool
+import orjson
+from asyncpg import create_pool
 
 import BASED.conf as conf
+from BASED.cache import ResponseCache
 from BASED.clients.mailing import MailClient
+from BASED.jobs.change_listener import ChangeListener
+from BASED.jobs.mail_dispatcher import MailDispatcher
+from BASED.jobs.warning_snapshot import WarningSnapshotJob
+from BASED.repository.db import Database, prepare_statements
+from BASED.repository.graph import TaskGraph
+from BASED.repository.mail_outbox import MailOutboxRepository
 from BASED.repository.task import TaskRepository
+from BASED.repository.task_warning import TaskWarningRepository
 from BASED.repository.user import UserRepository
 from BASED.repository.variable import VariableRepository
+from BASED.repository.version import DataVersion, DataVersionRepository
 
 
 class AppState:
@@ -15,35 +23,97 @@ class AppState:
         self._user = None
         self._variable = None
         self._task = None
+        self._task_graph = None
+        self._task_warning = None
+        self._warning_snapshot_job = None
+        self._data_version = None
+        self._data_version_repo = None
+        self._response_cache = None
         self._mail_client = None
+        self._mail_outbox = None
+        self._mail_dispatcher = None
+        self._change_listener = None
 
     async def init_connection(self, conn):
         await conn.set_type_codec(
             "jsonb",
-            encoder=json.dumps,
-            decoder=json.loads,
+            encoder=lambda value: orjson.dumps(value).decode(),
+            decoder=orjson.loads,
             schema="pg_catalog",
         )
+        if not conf.DATABASE_PGBOUNCER:
+            await prepare_statements(conn)
 
     async def startup(self) -> None:
-        self._db = await create_pool(
-            dsn=conf.DATABASE_DSN, init=self.init_connection
+        self._data_version = DataVersion()
+        source = f"based-{self._data_version.epoch}"
+        self._db = Database(
+            await create_pool(
+                dsn=conf.DATABASE_DSN,
+                init=self.init_connection,
+                min_size=conf.DATABASE_POOL_MIN_SIZE,
+                max_size=conf.DATABASE_POOL_MAX_SIZE,
+                statement_cache_size=(
+                    0
+                    if conf.DATABASE_PGBOUNCER
+                    else conf.DATABASE_STATEMENT_CACHE_SIZE
+                ),
+                server_settings={"application_name": source},
+            ),
+            on_commit=self._data_version.bump,
+        )
+        self._response_cache = ResponseCache(
+            max_entries=conf.RESPONSE_CACHE_MAX_ENTRIES,
+            max_bytes=conf.RESPONSE_CACHE_MAX_BYTES,
+        )
+        self._data_version_repo = DataVersionRepository(db=self._db)
+        self._user = UserRepository(db=self._db, version=self._data_version)
+        self._task_graph = TaskGraph()
+        self._task = TaskRepository(
+            db=self._db, graph=self._task_graph, version=self._data_version
         )
-        self._user = UserRepository(db=self._db)
-        self._task = TaskRepository(db=self._db)
+        await self._task.load_graph()
+        self._change_listener = ChangeListener(
+            dsn=conf.DATABASE_LISTEN_DSN,
+            source=source,
+            task_repo=self._task,
+            version=self._data_version,
+        )
+        self._change_listener.start()
+        self._task_warning = TaskWarningRepository(db=self._db)
         self._mail_client = MailClient(
             host=conf.SMTP_HOST,
             port=conf.SMTP_PORT,
             username=conf.SMTP_USERNAME,
             password=conf.SMTP_PASSWORD,
+            sender=conf.SMTP_SENDER,
+            use_tls=conf.SMTP_USE_TLS,
+        )
+        self._mail_outbox = MailOutboxRepository(db=self._db)
+        self._mail_dispatcher = MailDispatcher(
+            repo=self._mail_outbox, client=self._mail_client
+        )
+        self._mail_dispatcher.start()
+        self._warning_snapshot_job = WarningSnapshotJob(
+            repo=self._task_warning, mail_dispatcher=self._mail_dispatcher
         )
+        self._data_version.subscribe(
+            self._warning_snapshot_job.request_rebuild
+        )
+        self._warning_snapshot_job.start()
 
     async def shutdown(self) -> None:
+        if self._change_listener:
+            await self._change_listener.stop()
+        if self._warning_snapshot_job:
+            await self._warning_snapshot_job.stop()
+        if self._mail_dispatcher:
+            await self._mail_dispatcher.stop()
         if self._db:
             await self._db.close()
 
     @property
-    def db(self) -> Pool:
+    def db(self) -> Database:
         assert self._db
         return self._db
 
@@ -62,10 +132,45 @@ class AppState:
         assert self._task
         return self._task
 
+    @property
+    def task_warning_repo(self) -> TaskWarningRepository:
+        assert self._task_warning
+        return self._task_warning
+
+    @property
+    def task_graph(self) -> TaskGraph:
+        assert self._task_graph
+        return self._task_graph
+
+    @property
+    def data_version(self) -> DataVersion:
+        assert self._data_version
+        return self._data_version
+
+    @property
+    def data_version_repo(self) -> DataVersionRepository:
+        assert self._data_version_repo
+        return self._data_version_repo
+
+    @property
+    def response_cache(self) -> ResponseCache:
+        assert self._response_cache
+        return self._response_cache
+
     @property
     def mail_client(self) -> MailClient:
         assert self._mail_client
         return self._mail_client
 
+    @property
+    def mail_outbox_repo(self) -> MailOutboxRepository:
+        assert self._mail_outbox
+        return self._mail_outbox
+
+    @property
+    def mail_dispatcher(self) -> MailDispatcher:
+        assert self._mail_dispatcher
+        return self._mail_dispatcher
+
 
 app_state = AppState()
@@ -0,0 +1,114 @@
+"""
+Сравнивает скорость создания моделей репозиториев из строк базы:
+полная валидация pydantic против build_row_mapper.
+
+Строки генерируются в памяти с теми же типами, что отдаёт asyncpg:
+
+    python -m BASED.tools.bench_hydration --rows 10000
+"""
+
+import argparse
+import time
+from datetime import date, datetime, timedelta
+
+from tabulate import tabulate
+
+from BASED.repository.task import (
+    Task,
+    TaskDepends,
+    TaskStatusEnum,
+    task_depends_from_row,
+    task_from_row,
+)
+from BASED.repository.user import User, user_from_row
+
+
+def make_task_rows(rows: int) -> list[dict]:
+    today = date.today()
+    now = datetime.now()
+    statuses = list(TaskStatusEnum)
+    return [
+        {
+            "id": i,
+            "responsible_user_id": i % 200,
+            "status": statuses[i % 3].value,
+            "title": f"task {i}",
+            "description": "description " * 20,
+            "deadline": today + timedelta(days=i % 365),
+            "days_for_completion": 1 + i % 10,
+            "actual_start_date": None if i % 3 == 0 else today,
+            "actual_finish_date": today if i % 3 == 2 else None,
+            "actual_completion_days": None,
+            "is_archived": False,
+            "created_timestamp": now,
+            "cross_deadline": today if i % 2 else None,
+            "task_delay_caused_by": i + 1 if i % 2 else None,
+            "cross_finish_date": None,
+        }
+        for i in range(rows)
+    ]
+
+
+def make_task_depends_rows(rows: int) -> list[dict]:
+    now = datetime.now()
+    return [
+        {"task_id": i, "depends_task_id": i + 1, "created_timestamp": now}
+        for i in range(rows)
+    ]
+
+
+def make_user_rows(rows: int) -> list[dict]:
+    return [{"id": i, "name": f"user {i}"} for i in range(rows)]
+
+
+def measure(func, rows: list[dict], repeat: int) -> float:
+    elapsed = []
+    for _ in range(repeat):
+        time_start = time.perf_counter()
+        for row in rows:
+            func(row)
+        elapsed.append(time.perf_counter() - time_start)
+
+    return min(elapsed) * 1000
+
+
+def main(rows: int, repeat: int) -> None:
+    cases = [
+        ("Task", Task, task_from_row, make_task_rows(rows)),
+        (
+            "TaskDepends",
+            TaskDepends,
+            task_depends_from_row,
+            make_task_depends_rows(rows),
+        ),
+        ("User", User, user_from_row, make_user_rows(rows)),
+    ]
+    table = []
+    for name, model, mapper, model_rows in cases:
+        assert mapper(model_rows[0]) == model(**dict(model_rows[0]))
+        validated = measure(lambda row: model(**dict(row)), model_rows, repeat)
+        mapped = measure(mapper, model_rows, repeat)
+        table.append(
+            (
+                name,
+                round(validated, 1),
+                round(mapped, 1),
+                round(validated / mapped, 1),
+            )
+        )
+
+    print(f"rows={rows}, best of {repeat}")
+    print(
+        tabulate(
+            table,
+            headers=["model", "validate ms", "row mapper ms", "speedup"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(rows=args.rows, repeat=args.repeat)
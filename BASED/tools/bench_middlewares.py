@@ -0,0 +1,120 @@
+"""
+Замеряет накладные расходы middleware на один запрос.
+
+Запросы подаются напрямую в ASGI-приложение без сети. Сравниваются
+приложение без middleware, прежний стек из четырёх http-middleware
+(BaseHTTPMiddleware, которые только вызывают call_next)
+и ObservabilityMiddleware:
+
+    python -m BASED.tools.bench_middlewares --requests 5000
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+from tabulate import tabulate
+
+from BASED.middlewares import ObservabilityMiddleware
+
+ROUTES = 30
+
+
+async def call_next_middleware(request, call_next):
+    return await call_next(request)
+
+
+def make_app(middlewares: str) -> FastAPI:
+    app = FastAPI()
+    for i in range(ROUTES):
+        app.add_api_route(f"/route_{i}/{{item_id}}", lambda item_id: None)
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    match middlewares:
+        case "http":
+            for _ in range(4):
+                app.add_middleware(
+                    BaseHTTPMiddleware, dispatch=call_next_middleware
+                )
+        case "asgi":
+            app.add_middleware(ObservabilityMiddleware)
+
+    return app
+
+
+async def request(app: FastAPI) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "server": ("bench", 80),
+        "client": ("127.0.0.1", 5000),
+    }
+
+    request_sent = False
+    response_complete = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        await response_complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and not message.get(
+            "more_body"
+        ):
+            response_complete.set()
+
+    await app(scope, receive, send)
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    for _ in range(100):
+        await request(app)
+
+    time_start = time.perf_counter()
+    for _ in range(requests):
+        await request(app)
+
+    return (time.perf_counter() - time_start) / requests * 1_000_000
+
+
+async def main(requests: int) -> None:
+    logging.disable(logging.INFO)
+    results = {}
+    for middlewares in ("none", "http", "asgi"):
+        results[middlewares] = await measure(make_app(middlewares), requests)
+
+    print(
+        tabulate(
+            [
+                (name, round(elapsed, 1), round(elapsed - results["none"], 1))
+                for name, elapsed in results.items()
+            ],
+            headers=["middlewares", "us/request", "overhead us/request"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(requests=args.requests))
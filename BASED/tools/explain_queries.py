@@ -0,0 +1,354 @@
+"""
+Выполняет EXPLAIN (ANALYZE) для каждого запроса репозиториев
+на заполненной тестовыми данными базе.
+
+Все данные создаются внутри транзакции, которая откатывается в конце,
+поэтому скрипт можно запускать на базе разработки:
+
+    python -m BASED.tools.explain_queries --tasks 20000
+"""
+
+import argparse
+import asyncio
+import inspect
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+
+from asyncpg import Connection, connect
+
+import BASED.conf as conf
+from BASED.repository.graph import TaskGraph
+from BASED.repository.mail_outbox import MailOutboxRepository
+from BASED.repository.task import TaskCreate, TaskRepository, TaskStatusEnum
+from BASED.repository.task_warning import TaskWarningRepository
+from BASED.repository.user import UserRepository
+from BASED.repository.version import DataVersion, DataVersionRepository
+from BASED.state import app_state
+
+EXPLAINABLE = ("select", "insert", "update", "delete", "with")
+
+SEED_USERS_SQL = """
+    insert into "user" ("name")
+    select 'user ' || i from generate_series(1, $1) as i
+"""
+SEED_TASKS_SQL = """
+    insert into "task" (
+        "title", "description", "status", "responsible_user_id",
+        "deadline", "days_for_completion", "actual_start_date",
+        "is_archived"
+    )
+    select
+        'task ' || i,
+        repeat('description ', 20),
+        (array['to_do', 'in_progress', 'done'])[1 + i % 3],
+        (select min("id") from "user") + i % $2,
+        current_date + i % 365,
+        1 + i % 10,
+        case when i % 3 = 0 then null else current_date - i % 10 end,
+        i % 5 = 0
+    from generate_series(1, $1) as i
+"""
+SEED_DEPENDS_SQL = """
+    insert into "task_depends" ("task_id", "depends_task_id")
+    select "task"."id", "task"."id" - 1 - (d * 37) % 997
+    from "task", generate_series(1, $1) as d
+    where "task"."id" - 1 - (d * 37) % 997 >= (select min("id") from "task")
+    on conflict do nothing
+"""
+
+
+class ExplainConnection:
+    """
+    Обёртка над соединением: перед выполнением запроса снимает его план
+    в откатываемой точке сохранения, затем выполняет запрос как обычно.
+    """
+
+    def __init__(self, conn: Connection) -> None:
+        self._conn = conn
+        self.label = ""
+        self.plans: list[tuple[str, str, str]] = []
+
+    async def _explain(self, sql: str, args: tuple) -> None:
+        if not sql.lstrip().lower().startswith(EXPLAINABLE):
+            return
+
+        savepoint = self._conn.transaction()
+        await savepoint.start()
+        try:
+            rows = await self._conn.fetch(
+                f"explain (analyze, buffers) {sql}", *args
+            )
+        finally:
+            await savepoint.rollback()
+
+        plan = "\n".join(row[0] for row in rows)
+        self.plans.append((self.label, sql, plan))
+
+    async def fetch(self, sql: str, *args):
+        await self._explain(sql, args)
+        return await self._conn.fetch(sql, *args)
+
+    async def fetchval(self, sql: str, *args):
+        await self._explain(sql, args)
+        return await self._conn.fetchval(sql, *args)
+
+    async def fetchrow(self, sql: str, *args):
+        await self._explain(sql, args)
+        return await self._conn.fetchrow(sql, *args)
+
+    async def execute(self, sql: str, *args):
+        await self._explain(sql, args)
+        return await self._conn.execute(sql, *args)
+
+    async def executemany(self, sql: str, args: list):
+        if args:
+            await self._explain(sql, tuple(args[0]))
+        return await self._conn.executemany(sql, args)
+
+    async def _iter_cursor(self, sql: str, args: tuple, kwargs: dict):
+        await self._explain(sql, args)
+        async for row in self._conn.cursor(sql, *args, **kwargs):
+            yield row
+
+    def cursor(self, sql: str, *args, **kwargs):
+        return self._iter_cursor(sql, args, kwargs)
+
+    def transaction(self, **kwargs):
+        return self._conn.transaction(**kwargs)
+
+    def is_in_transaction(self) -> bool:
+        return self._conn.is_in_transaction()
+
+
+class ExplainPool:
+    def __init__(self, conn: ExplainConnection) -> None:
+        self._conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self._conn
+
+    def after_commit(self, callback) -> None:
+        callback()
+
+
+async def consume(iterator) -> None:
+    async for _ in iterator:
+        pass
+
+
+async def seed(conn: Connection, tasks: int, users: int, depends: int):
+    await conn.execute(SEED_USERS_SQL, users)
+    await conn.execute(SEED_TASKS_SQL, tasks, users)
+    await conn.execute(SEED_DEPENDS_SQL, depends)
+    await conn.execute('analyze "user", "task", "task_depends"')
+
+
+def get_repository_calls(
+    task_repo: TaskRepository,
+    user_repo: UserRepository,
+    task_warning_repo: TaskWarningRepository,
+    mail_outbox_repo: MailOutboxRepository,
+    data_version_repo: DataVersionRepository,
+    ids: dict,
+) -> dict:
+    task_id = ids["task_id"]
+    other_task_id = ids["other_task_id"]
+    user_id = ids["user_id"]
+    deadline = date.today() + timedelta(days=30)
+    return {
+        task_repo: {
+            "load_graph": lambda: task_repo.load_graph(),
+            "create": lambda: task_repo.create(
+                TaskCreate(
+                    status=TaskStatusEnum.to_do,
+                    title="explain",
+                    description=None,
+                    deadline=deadline,
+                    responsible_user_id=user_id,
+                    days_for_completion=3,
+                )
+            ),
+            "refresh_graph": lambda: task_repo.refresh_graph(
+                [task_id, other_task_id]
+            ),
+            "get_by_id": lambda: task_repo.get_by_id(task_id),
+            "update_task_data": lambda: task_repo.update_task_data(
+                task_id=task_id,
+                title="explain",
+                description=None,
+                deadline=deadline,
+                responsible_user_id=user_id,
+                days_for_completion=3,
+            ),
+            "transition_status": lambda: task_repo.transition_status(
+                task_id=task_id,
+                new_status=TaskStatusEnum.done,
+                as_of=date.today(),
+            ),
+            "get_task_depends": lambda: task_repo.get_task_depends(task_id),
+            "get_tasks_dependent_of": (
+                lambda: task_repo.get_tasks_dependent_of(task_id)
+            ),
+            "add_task_depends": lambda: task_repo.add_task_depends(
+                other_task_id, task_id
+            ),
+            "add_task_depends_batch": (
+                lambda: task_repo.add_task_depends_batch(
+                    [(other_task_id, task_id), (task_id, other_task_id)]
+                )
+            ),
+            "del_tasks_depends": lambda: task_repo.del_tasks_depends(
+                other_task_id, task_id
+            ),
+            "update_task_archive_status": (
+                lambda: task_repo.update_task_archive_status(
+                    task_id=task_id, archive_status=False
+                )
+            ),
+            "update_task_deadline": lambda: task_repo.update_task_deadline(
+                task_id=task_id, new_deadline=deadline
+            ),
+            "get_short_tasks_page": lambda: task_repo.get_short_tasks_page(
+                limit=101, after_id=task_id // 2
+            ),
+            "get_tasks_ordered_by_deadline": (
+                lambda: task_repo.get_tasks_ordered_by_deadline()
+            ),
+            "iter_tasks": lambda: consume(
+                task_repo.iter_tasks(chunk_size=500)
+            ),
+            "iter_active_tasks_with_relations": lambda: consume(
+                task_repo.iter_active_tasks_with_relations(chunk_size=500)
+            ),
+            "get_all_task_dependencies": (
+                lambda: task_repo.get_all_task_dependencies(task_id)
+            ),
+            "get_task_neighbourhood": (
+                lambda: task_repo.get_task_neighbourhood(task_id)
+            ),
+            "del_responsible_user_id": (
+                lambda: task_repo.del_responsible_user_id(user_id)
+            ),
+        },
+        user_repo: {
+            "create_user": lambda: user_repo.create_user("explain"),
+            "get_users_page": lambda: user_repo.get_users_page(limit=101),
+            "get_by_id": lambda: user_repo.get_by_id(user_id),
+            "get_by_ids": lambda: user_repo.get_by_ids([user_id]),
+            "del_user": lambda: user_repo.del_user(user_id),
+        },
+        task_warning_repo: {
+            "rebuild_snapshot": lambda: task_warning_repo.rebuild_snapshot(
+                as_of=date.today(),
+                compute=lambda tasks: [],
+                notify_types=["start_hard", "late_deadline"],
+                notify=lambda warnings: [],
+            ),
+            "get_warnings": lambda: task_warning_repo.get_warnings(
+                as_of=date.today(), task_ids=[task_id, other_task_id]
+            ),
+        },
+        mail_outbox_repo: {
+            "enqueue": lambda: mail_outbox_repo.enqueue(
+                [(["explain@example.com"], "explain", "explain")]
+            ),
+            "claim_batch": lambda: mail_outbox_repo.claim_batch(
+                limit=50, lease_seconds=300, max_attempts=10
+            ),
+            "mark_sent": lambda: mail_outbox_repo.mark_sent([1]),
+            "mark_failed": lambda: mail_outbox_repo.mark_failed(
+                id_=1, retry_seconds=5, error="explain"
+            ),
+            "release": lambda: mail_outbox_repo.release([1]),
+        },
+        data_version_repo: {
+            "get_value": lambda: data_version_repo.get_value(),
+        },
+    }
+
+
+def get_uncovered_methods(calls: dict) -> list[str]:
+    uncovered = []
+    for repo, repo_calls in calls.items():
+        for name, method in inspect.getmembers(repo, inspect.ismethod):
+            if (
+                not name.startswith("_")
+                and (
+                    inspect.iscoroutinefunction(method)
+                    or inspect.isasyncgenfunction(method)
+                )
+                and name not in repo_calls
+            ):
+                uncovered.append(f"{type(repo).__name__}.{name}")
+
+    return uncovered
+
+
+async def main(tasks: int, users: int, depends: int) -> None:
+    conn = await connect(dsn=conf.DATABASE_DSN)
+    await app_state.init_connection(conn)
+    transaction = conn.transaction()
+    await transaction.start()
+    try:
+        await seed(conn, tasks=tasks, users=users, depends=depends)
+        row = await conn.fetchrow(
+            """
+            select max("task_id") as "task_id",
+             min("task_id") as "other_task_id",
+             (select max("id") from "user") as "user_id"
+            from "task_depends"
+            """
+        )
+
+        explain_conn = ExplainConnection(conn)
+        pool = ExplainPool(explain_conn)
+        version = DataVersion()
+        task_repo = TaskRepository(db=pool, graph=TaskGraph(), version=version)
+        user_repo = UserRepository(db=pool, version=version)
+        task_warning_repo = TaskWarningRepository(db=pool)
+        mail_outbox_repo = MailOutboxRepository(db=pool)
+        data_version_repo = DataVersionRepository(db=pool)
+        calls = get_repository_calls(
+            task_repo,
+            user_repo,
+            task_warning_repo,
+            mail_outbox_repo,
+            data_version_repo,
+            dict(row),
+        )
+        for repo, repo_calls in calls.items():
+            for name, call in repo_calls.items():
+                explain_conn.label = f"{type(repo).__name__}.{name}"
+                await call()
+    finally:
+        await transaction.rollback()
+        await conn.close()
+
+    seq_scans = []
+    for label, sql, plan in explain_conn.plans:
+        print(f"=== {label}")
+        print(sql.strip())
+        print(plan)
+        print()
+        if "Seq Scan" in plan:
+            seq_scans.append(label)
+
+    print("Queries with sequential scans:")
+    for label in sorted(set(seq_scans)):
+        print(f"  {label}")
+
+    uncovered = get_uncovered_methods(calls)
+    if uncovered:
+        print("Repository methods not covered by this script:")
+        for name in uncovered:
+            print(f"  {name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--depends", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(tasks=args.tasks, users=args.users, depends=args.depends))
@@ -1,146 +1,58 @@
 import logging
+from collections import defaultdict
 from datetime import date, timedelta
 
 from BASED.conf import TIME_RESERVE_COEF
 from BASED.repository.task import Task, TaskStatusEnum, TaskStatusOrder
 from BASED.state import app_state
-from BASED.views.dashboard.models import WarningModel, WarningTypeEnum
+from BASED.views.dashboard.models import ActiveTasks, WarningModel
+from BASED.views.dashboard.warnings import get_tasks_warnings
 
 logger = logging.getLogger(__name__)
 
 
-def get_warnings_list(task: Task) -> list[WarningModel]:
-    warnings = []
-    current_date = date.today()
-    match task.status:
-        case TaskStatusEnum.to_do:
-            if current_date >= task.deadline - timedelta(
-                days=task.days_for_completion - 1
-            ):
-                warnings.append(
-                    WarningModel(
-                        type=WarningTypeEnum.start_hard, task_id=task.id
-                    )
-                )
-            elif current_date >= task.deadline - timedelta(
-                days=int(task.days_for_completion * TIME_RESERVE_COEF)
-            ):
-                warnings.append(
-                    WarningModel(
-                        type=WarningTypeEnum.start_soft, task_id=task.id
-                    )
-                )
-        case TaskStatusEnum.in_progress:
-            days_in_work = (current_date - task.actual_start_date).days
-            days_to_deadline = task.days_for_completion - days_in_work
-            if days_to_deadline < 0:
-                days_to_deadline = 0
-
-            if current_date >= task.deadline - timedelta(
-                days=days_to_deadline - 1
-            ):
-                warnings.append(
-                    WarningModel(
-                        type=WarningTypeEnum.finish_hard, task_id=task.id
-                    )
-                )
-            elif current_date >= task.deadline - timedelta(
-                days=int(days_to_deadline * TIME_RESERVE_COEF)
-            ):
-                warnings.append(
-                    WarningModel(
-                        type=WarningTypeEnum.finish_soft, task_id=task.id
-                    )
-                )
-
-    if (
-        task.status == TaskStatusEnum.done
-        and task.actual_finish_date > task.deadline
-    ):
-        warnings.append(
-            WarningModel(type=WarningTypeEnum.late_deadline, task_id=task.id)
-        )
-    elif task.status != TaskStatusEnum.done and current_date > task.deadline:
-        warnings.append(
-            WarningModel(type=WarningTypeEnum.late_deadline, task_id=task.id)
+async def get_snapshot_warnings(
+    task_ids: list[int] | None = None,
+) -> dict[int, list[WarningModel]] | None:
+    """
+    Получает предупреждения активных задач из снимка на сегодня.
+    Возвращает None, если снимок ещё не пересчитан после изменений.
+    """
+    task_warnings = await app_state.task_warning_repo.get_warnings(
+        as_of=date.today(), task_ids=task_ids
+    )
+    if task_warnings is None:
+        return
+
+    warnings = defaultdict(list)
+    for task_warning in task_warnings:
+        warnings[task_warning.task_id].append(
+            WarningModel(
+                type=task_warning.type, task_id=task_warning.warning_task_id
+            )
         )
 
     return warnings
 
 
-async def get_warnings_with_cross(task: Task) -> list[WarningModel]:
-    warnings = get_warnings_list(task)
-    dependent_of_tasks = await app_state.task_repo.get_tasks_dependent_of(
-        dependent_task_id=task.id
-    )
-    if not dependent_of_tasks:
-        return warnings
-
-    tasks = []
-    for dependency in dependent_of_tasks:
-        tasks.append(
-            await app_state.task_repo.get_by_id(id_=dependency.task_id)
-        )
-
-    comparing_task = max(tasks, key=lambda x: x.deadline)
-
-    soft_start_date = task.deadline - timedelta(
-        days=int(task.days_for_completion * TIME_RESERVE_COEF)
+async def get_active_tasks_with_warnings() -> ActiveTasks:
+    """
+    Получает все активные задачи вместе с ответственными и предупреждениями.
+    Количество запросов к базе не зависит от числа задач.
+    """
+    tasks = await app_state.task_repo.get_tasks_ordered_by_deadline()
+    responsibles = await app_state.user_repo.get_by_ids(
+        ids=list({task.responsible_user_id for task in tasks})
     )
-    hard_start_date = task.deadline - timedelta(
-        days=task.days_for_completion - 1
+    warnings = await get_snapshot_warnings()
+    if warnings is None:
+        warnings = get_tasks_warnings(tasks)
+
+    return ActiveTasks(
+        tasks=tasks,
+        responsibles={user.id: user for user in responsibles},
+        warnings={task.id: warnings.get(task.id, []) for task in tasks},
     )
-    current_date = date.today()
-
-    cross_warning = None
-    if (
-        comparing_task.actual_finish_date
-        and comparing_task.actual_finish_date >= hard_start_date
-    ):
-        cross_warning = WarningModel(
-            type=WarningTypeEnum.cross_hard,
-            task_id=comparing_task.id,
-        )
-    elif (
-        comparing_task.actual_finish_date
-        and comparing_task.actual_finish_date >= soft_start_date
-    ):
-        cross_warning = WarningModel(
-            type=WarningTypeEnum.cross_soft,
-            task_id=comparing_task.id,
-        )
-    if (
-        comparing_task.actual_finish_date is None
-        and current_date > hard_start_date
-    ):
-        cross_warning = WarningModel(
-            type=WarningTypeEnum.cross_hard,
-            task_id=comparing_task.id,
-        )
-    elif (
-        comparing_task.actual_finish_date is None
-        and current_date > soft_start_date
-    ):
-        cross_warning = WarningModel(
-            type=WarningTypeEnum.cross_soft,
-            task_id=comparing_task.id,
-        )
-
-    if comparing_task.deadline > hard_start_date:
-        cross_warning = WarningModel(
-            type=WarningTypeEnum.cross_hard,
-            task_id=comparing_task.id,
-        )
-    elif comparing_task.deadline > soft_start_date:
-        cross_warning = WarningModel(
-            type=WarningTypeEnum.cross_soft,
-            task_id=comparing_task.id,
-        )
-
-    if cross_warning:
-        warnings.append(cross_warning)
-
-    return warnings
 
 
 def get_status_order_number(status: TaskStatusEnum) -> int:
@@ -3,7 +3,7 @@ from enum import StrEnum
 
 from pydantic import BaseModel
 
-from BASED.repository.task import DependencyTypeEnum, TaskStatusEnum
+from BASED.repository.task import DependencyTypeEnum, Task, TaskStatusEnum
 from BASED.repository.user import User
 
 
@@ -62,3 +62,48 @@ class TimelineTaskDependency(TimelineTask):
 
 class GetTimelineDependenciesResponse(BaseModel):
     tasks: list[TimelineTaskDependency]
+
+
+class ScheduledTask(BaseModel):
+    id: int
+    earliest_start: date
+    earliest_finish: date
+    latest_start: date
+    latest_finish: date
+    slack: int
+    is_critical: bool
+
+
+class GetTimelineScheduleResponse(BaseModel):
+    tasks: list[ScheduledTask]
+    critical_path: list[int]
+
+
+class TaskChange(BaseModel):
+    task_id: int
+    deadline: date | None = None
+    days_for_completion: int | None = None
+    status: TaskStatusEnum | None = None
+
+
+class SimulateBody(BaseModel):
+    changes: list[TaskChange]
+
+
+class SimulatedTask(BaseModel):
+    id: int
+    earliest_start: date
+    earliest_finish: date
+    shift_days: int
+    new_warnings: list[WarningModel]
+    resolved_warnings: list[WarningModel]
+
+
+class SimulateResponse(BaseModel):
+    tasks: list[SimulatedTask]
+
+
+class ActiveTasks(BaseModel):
+    tasks: list[Task]
+    responsibles: dict[int, User]
+    warnings: dict[int, list[WarningModel]]
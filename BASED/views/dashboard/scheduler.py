@@ -0,0 +1,218 @@
+from datetime import date
+
+import numpy as np
+
+from BASED.repository.graph import TaskGraph
+from BASED.repository.helpers import build_row_mapper
+from BASED.repository.task import Task, TaskStatusEnum
+from BASED.views.dashboard.models import ScheduledTask
+
+scheduled_task_from_dict = build_row_mapper(ScheduledTask)
+
+UNIX_EPOCH = date(1970, 1, 1).toordinal()
+
+
+def to_dates(ordinals: np.ndarray) -> list[date]:
+    return (ordinals - UNIX_EPOCH).astype("datetime64[D]").tolist()
+
+
+def get_positions(
+    ids: np.ndarray, *values: np.ndarray
+) -> tuple[np.ndarray, ...]:
+    """
+    Находит позиции значений в массиве уникальных неотрицательных ids.
+    Для отсутствующих в ids значений позиция равна -1.
+    """
+    last = int(ids.max()) + 1
+    lookup = np.full(last + 1, -1)
+    lookup[ids] = np.arange(ids.size)
+    return tuple(lookup[np.minimum(array, last)] for array in values)
+
+
+def get_levels(
+    size: int, src: np.ndarray, dst: np.ndarray
+) -> tuple[list[tuple[np.ndarray, ...]], np.ndarray]:
+    """
+    Разбивает вершины на уровни топологического порядка (алгоритм Кана):
+    вершина попадает на уровень после всех своих предшественников.
+    Если необработанных вершин без входящих рёбер не осталось, первая
+    по порядку необработанная вершина цикла выносится на отдельный
+    уровень, а замыкающие цикл рёбра отбрасываются.
+    Для каждого уровня возвращает его вершины, исходящие из них рёбра
+    (начала и концы, сгруппированные по вершинам) и число рёбер
+    каждой вершины, а также вершины, в которые входили замыкающие рёбра.
+    """
+    out_dst = dst[np.argsort(src)]
+    out_offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=size), out=out_offsets[1:])
+    indegree = np.bincount(dst, minlength=size)
+    is_ordered = np.zeros(size, dtype=bool)
+    frontier = np.flatnonzero(indegree == 0)
+    levels = []
+    cycle_closers = []
+    remaining = size
+    while remaining:
+        if not frontier.size:
+            frontier = np.flatnonzero(~is_ordered)[:1]
+        is_ordered[frontier] = True
+        remaining -= frontier.size
+
+        starts = out_offsets[frontier]
+        lengths = out_offsets[frontier + 1] - starts
+        total = int(lengths.sum())
+        shifts = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        sources = np.repeat(frontier, lengths)
+        targets = out_dst[shifts + np.arange(total)]
+        is_closer = is_ordered[targets]
+        if is_closer.any():
+            cycle_closers.append(targets[is_closer])
+            lengths = np.bincount(
+                np.repeat(np.arange(frontier.size), lengths)[~is_closer],
+                minlength=frontier.size,
+            )
+            sources = sources[~is_closer]
+            targets = targets[~is_closer]
+        levels.append((frontier, sources, targets, lengths))
+
+        np.subtract.at(indegree, targets, 1)
+        frontier = np.unique(targets[indegree[targets] == 0])
+
+    return levels, np.unique(np.concatenate(cycle_closers or [np.arange(0)]))
+
+
+def get_schedule(
+    tasks: list[Task], graph: TaskGraph, as_of: date | None = None
+) -> tuple[list[ScheduledTask], list[int]]:
+    """
+    Рассчитывает расписание задач по методу критического пути:
+    раннее начало и окончание с учётом предшественников, позднее начало
+    и окончание с учётом дедлайнов и последователей, резерв времени
+    и критический путь, определяющий дату окончания проекта.
+    Критическими считаются все задачи с нулевым или отрицательным
+    (задача уже не успевает к дедлайну) резервом.
+    Задачи обходятся по уровням топологического порядка, каждый уровень
+    считается целиком векторно; задачи в цикле зависимостей считаются
+    без учёта замыкающих рёбер.
+    Даты считаются в днях (ordinal), окончание включительно.
+    Возвращает расписание задач и id задач критического пути.
+    """
+    if not tasks:
+        return [], []
+
+    today = (as_of or date.today()).toordinal()
+    size = len(tasks)
+    task_ids = [task.id for task in tasks]
+    statuses = [task.status for task in tasks]
+    is_to_do = np.fromiter(
+        (status is TaskStatusEnum.to_do for status in statuses),
+        dtype=bool,
+        count=size,
+    )
+    duration = np.fromiter(
+        (task.days_for_completion for task in tasks),
+        dtype=np.int64,
+        count=size,
+    ).clip(min=1)
+    deadline = np.fromiter(
+        (task.deadline.toordinal() for task in tasks),
+        dtype=np.int64,
+        count=size,
+    )
+
+    earliest_start = np.full(size, today)
+    started = np.flatnonzero(~is_to_do).tolist()
+    earliest_start[started] = [
+        tasks[position].actual_start_date.toordinal() for position in started
+    ]
+    earliest_finish = earliest_start + duration - 1
+    in_progress = [
+        position
+        for position in started
+        if statuses[position] is TaskStatusEnum.in_progress
+    ]
+    earliest_finish[in_progress] = np.maximum(
+        earliest_finish[in_progress], today
+    )
+    done = [
+        position
+        for position in started
+        if statuses[position] is TaskStatusEnum.done
+    ]
+    earliest_finish[done] = [
+        tasks[position].actual_finish_date.toordinal() for position in done
+    ]
+
+    ids = np.array(task_ids)
+    src, dst = get_positions(ids, *reversed(graph.get_edge_arrays()))
+    found = (src >= 0) & (dst >= 0)
+    levels, cycle_closers = get_levels(size, src[found], dst[found])
+    cycle_closers = cycle_closers[is_to_do[cycle_closers]]
+    earliest_start[cycle_closers] += 1
+    earliest_finish[cycle_closers] += 1
+
+    pred_finish = np.full(size, today - 1)
+    for nodes, sources, targets, _ in levels:
+        nodes = nodes[is_to_do[nodes]]
+        start = np.maximum(pred_finish[nodes] + 1, earliest_start[nodes])
+        earliest_start[nodes] = start
+        earliest_finish[nodes] = start + duration[nodes] - 1
+        np.maximum.at(pred_finish, targets, earliest_finish[sources])
+
+    latest_finish = deadline.copy()
+    latest_start = latest_finish - duration + 1
+    for nodes, _, targets, lengths in reversed(levels):
+        if not targets.size:
+            continue
+        has_succs = lengths > 0
+        nodes = nodes[has_succs]
+        offsets = (np.cumsum(lengths) - lengths)[has_succs]
+        finish = np.minimum(
+            np.minimum.reduceat(latest_start[targets], offsets) - 1,
+            deadline[nodes],
+        )
+        latest_finish[nodes] = finish
+        latest_start[nodes] = finish - duration[nodes] + 1
+
+    positions = dict(zip(task_ids, range(size)))
+    critical_path = []
+    traced = set()
+    position = int(np.argmax(earliest_finish))
+    while position is not None and position not in traced:
+        traced.add(position)
+        task_id = task_ids[position]
+        critical_path.append(task_id)
+        driver_start = earliest_start[position] - 1
+        drivers = [
+            positions[pred_id]
+            for pred_id in graph.get_depends_of(task_id)
+            if pred_id in positions
+            and earliest_finish[positions[pred_id]] == driver_start
+        ]
+        position = min(drivers) if drivers else None
+    critical_path.reverse()
+
+    slack = latest_finish - earliest_finish
+    scheduled_tasks = [
+        scheduled_task_from_dict(
+            {
+                "id": task_id,
+                "earliest_start": es,
+                "earliest_finish": ef,
+                "latest_start": ls,
+                "latest_finish": lf,
+                "slack": task_slack,
+                "is_critical": is_critical,
+            }
+        )
+        for task_id, es, ef, ls, lf, task_slack, is_critical in zip(
+            task_ids,
+            to_dates(earliest_start),
+            to_dates(earliest_finish),
+            to_dates(latest_start),
+            to_dates(latest_finish),
+            slack.tolist(),
+            (slack <= 0).tolist(),
+        )
+    ]
+
+    return scheduled_tasks, critical_path
@@ -0,0 +1,212 @@
+from datetime import date
+from typing import Callable, Iterable
+
+from BASED.repository.graph import TaskGraph
+from BASED.repository.task import Task, TaskStatusEnum
+from BASED.views.dashboard.models import (
+    SimulatedTask,
+    TaskChange,
+    WarningModel,
+)
+from BASED.views.dashboard.scheduler import get_schedule
+from BASED.views.dashboard.warnings import get_tasks_warnings
+
+
+def get_reachable(
+    start_ids: Iterable[int], get_next: Callable[[int], set[int]]
+) -> set[int]:
+    """
+    Получает задачи, достижимые из start_ids (включая их самих).
+    """
+    reachable = set(start_ids)
+    stack = list(reachable)
+    while stack:
+        for next_id in get_next(stack.pop()):
+            if next_id not in reachable:
+                reachable.add(next_id)
+                stack.append(next_id)
+
+    return reachable
+
+
+def get_changes_error(
+    tasks_by_id: dict[int, Task], changes: list[TaskChange]
+) -> str | None:
+    """
+    Проверяет изменения в том порядке, в котором они применяются:
+    переход статуса сверяется со статусом, оставленным предыдущими
+    изменениями той же задачи. Возвращает описание ошибки или None.
+    """
+    statuses = {}
+    for change in changes:
+        task = tasks_by_id.get(change.task_id)
+        if not task:
+            return "Task not found."
+
+        current_status = statuses.get(change.task_id, task.status)
+        if (
+            change.status == TaskStatusEnum.done
+            and current_status == TaskStatusEnum.to_do
+        ):
+            return "Task cannot be done immediately from to_do"
+        if change.status is not None:
+            statuses[change.task_id] = change.status
+
+
+def apply_task_change(task: Task, change: TaskChange, as_of: date) -> Task:
+    """
+    Применяет изменение к копии задачи по тем же правилам,
+    что и /edit_deadline, /edit_task и /update_task_status.
+    """
+    update = {}
+    if change.deadline is not None:
+        update["deadline"] = change.deadline
+    if change.days_for_completion is not None:
+        update["days_for_completion"] = change.days_for_completion
+
+    match change.status:
+        case TaskStatusEnum.to_do:
+            update["actual_start_date"] = None
+            update["actual_finish_date"] = None
+        case TaskStatusEnum.in_progress:
+            update["actual_start_date"] = (
+                as_of
+                if task.status == TaskStatusEnum.to_do
+                else task.actual_start_date
+            )
+            update["actual_finish_date"] = None
+        case TaskStatusEnum.done:
+            update["actual_finish_date"] = (
+                as_of
+                if task.status != TaskStatusEnum.done
+                else task.actual_start_date
+            )
+    if change.status is not None:
+        update["status"] = change.status
+
+    return task.model_copy(update=update)
+
+
+def refresh_cross_fields(
+    tasks: dict[int, Task], graph: TaskGraph, task_ids: Iterable[int]
+) -> None:
+    """
+    Пересчитывает в памяти данные о самой поздней из зависящих задач
+    так же, как это делает триггер refresh_cross_deadline.
+    Зависящие задачи, которых нет в tasks, учитываются по сохранённым
+    в строке задачи данным.
+    """
+    for task_id in task_ids:
+        task = tasks[task_id]
+        candidates = [
+            (dependent.deadline, dependent.id, dependent.actual_finish_date)
+            for dependent in map(tasks.get, graph.get_dependent_for(task_id))
+            if dependent is not None
+        ]
+        if (
+            task.task_delay_caused_by is not None
+            and task.task_delay_caused_by not in tasks
+        ):
+            candidates.append(
+                (
+                    task.cross_deadline,
+                    task.task_delay_caused_by,
+                    task.cross_finish_date,
+                )
+            )
+
+        cross_deadline, task_delay_caused_by, cross_finish_date = max(
+            candidates, default=(None, None, None)
+        )
+        tasks[task_id] = task.model_copy(
+            update={
+                "cross_deadline": cross_deadline,
+                "task_delay_caused_by": task_delay_caused_by,
+                "cross_finish_date": cross_finish_date,
+            }
+        )
+
+
+def get_warnings_diff(
+    before: list[WarningModel], after: list[WarningModel]
+) -> tuple[list[WarningModel], list[WarningModel]]:
+    """
+    Возвращает появившиеся и исчезнувшие предупреждения.
+    """
+    new_warnings = [warning for warning in after if warning not in before]
+    resolved_warnings = [warning for warning in before if warning not in after]
+    return new_warnings, resolved_warnings
+
+
+def get_simulation(
+    tasks: list[Task],
+    graph: TaskGraph,
+    changes: list[TaskChange],
+    as_of: date | None = None,
+) -> list[SimulatedTask]:
+    """
+    Применяет гипотетические изменения к копиям задач и возвращает
+    задачи, у которых изменились предупреждения или сдвинулись даты.
+    Пересчитываются только изменённые задачи, задачи, от которых они
+    зависят (пересечения), и все транзитивно зависящие от них задачи.
+    """
+    as_of = as_of or date.today()
+    tasks_by_id = {task.id: task for task in tasks}
+    simulated_tasks = dict(tasks_by_id)
+    for change in changes:
+        simulated_tasks[change.task_id] = apply_task_change(
+            simulated_tasks[change.task_id], change, as_of
+        )
+
+    changed_ids = {change.task_id for change in changes}
+    upstream_ids = set()
+    for task_id in changed_ids:
+        upstream_ids |= graph.get_depends_of(task_id) & tasks_by_id.keys()
+    refresh_cross_fields(simulated_tasks, graph, upstream_ids)
+
+    downstream_ids = get_reachable(changed_ids, graph.get_dependent_for)
+    downstream_ids &= tasks_by_id.keys()
+    scope_ids = get_reachable(downstream_ids, graph.get_depends_of)
+    scope_ids &= tasks_by_id.keys()
+    affected_ids = downstream_ids | upstream_ids
+
+    scope_tasks = [task for task in tasks if task.id in scope_ids]
+    schedule_before, _ = get_schedule(scope_tasks, graph, as_of)
+    schedule_after, _ = get_schedule(
+        [simulated_tasks[task.id] for task in scope_tasks], graph, as_of
+    )
+    finish_before = {
+        scheduled.id: scheduled.earliest_finish
+        for scheduled in schedule_before
+    }
+    warnings_before = get_tasks_warnings(
+        [tasks_by_id[task_id] for task_id in affected_ids], as_of
+    )
+    warnings_after = get_tasks_warnings(
+        [simulated_tasks[task_id] for task_id in affected_ids], as_of
+    )
+
+    simulated = []
+    for scheduled in schedule_after:
+        if scheduled.id not in affected_ids:
+            continue
+
+        shift_days = (
+            scheduled.earliest_finish - finish_before[scheduled.id]
+        ).days
+        new_warnings, resolved_warnings = get_warnings_diff(
+            warnings_before[scheduled.id], warnings_after[scheduled.id]
+        )
+        if shift_days or new_warnings or resolved_warnings:
+            simulated.append(
+                SimulatedTask(
+                    id=scheduled.id,
+                    earliest_start=scheduled.earliest_start,
+                    earliest_finish=scheduled.earliest_finish,
+                    shift_days=shift_days,
+                    new_warnings=new_warnings,
+                    resolved_warnings=resolved_warnings,
+                )
+            )
+
+    return simulated
@@ -1,23 +1,31 @@
 import logging
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request
+from starlette import status
 
 from BASED.repository.task import TaskStatusEnum
 from BASED.state import app_state
 from BASED.views.dashboard.helpers import (
+    get_active_tasks_with_warnings,
     get_start_finish_date,
     get_status_order_number,
-    get_warnings_with_cross,
 )
 from BASED.views.dashboard.models import (
     DashboardTask,
     DashboardTasksByStatus,
     GetDashboardTasksResponse,
     GetTimelineDependenciesResponse,
+    GetTimelineScheduleResponse,
     GetTimelineTasksResponse,
+    SimulateBody,
+    SimulateResponse,
     TimelineTask,
     TimelineTaskDependency,
 )
+from BASED.views.dashboard.scheduler import get_schedule
+from BASED.views.dashboard.simulation import get_changes_error, get_simulation
+from BASED.views.dashboard.warnings import get_warnings_with_cross
+from BASED.views.helpers import get_cached_response, get_model_response
 
 logger = logging.getLogger(__name__)
 
@@ -25,21 +33,24 @@ router = APIRouter(tags=["dashboard"])
 
 
 @router.get(path="/dashboard_tasks", response_model=GetDashboardTasksResponse)
-async def get_dashboard_tasks():
-    tasks = await app_state.task_repo.get_tasks_ordered_by_deadline()
+async def get_dashboard_tasks(request: Request):
+    return await get_cached_response(request, build_dashboard_tasks)
+
+
+async def build_dashboard_tasks() -> GetDashboardTasksResponse:
+    active_tasks = await get_active_tasks_with_warnings()
+    tasks = active_tasks.tasks
 
     statuses = {}
     for task in tasks:
-        responsible = await app_state.user_repo.get_by_id(
-            id_=task.responsible_user_id
-        )
-        warnings_list = await get_warnings_with_cross(task)
         dashboard_task = DashboardTask(
             id=task.id,
             title=task.title,
             deadline=task.deadline,
-            responsible=responsible,
-            warnings=warnings_list,
+            responsible=active_tasks.responsibles.get(
+                task.responsible_user_id
+            ),
+            warnings=active_tasks.warnings[task.id],
         )
         if task.status in statuses:
             statuses[task.status].append(dashboard_task)
@@ -66,14 +77,14 @@ async def get_dashboard_tasks():
 
 
 @router.get("/timeline_tasks", response_model=GetTimelineTasksResponse)
-async def get_timeline_tasks():
-    tasks = await app_state.task_repo.get_tasks_ordered_by_deadline()
+async def get_timeline_tasks(request: Request):
+    return await get_cached_response(request, build_timeline_tasks)
+
+
+async def build_timeline_tasks() -> GetTimelineTasksResponse:
+    active_tasks = await get_active_tasks_with_warnings()
     timeline_tasks = []
-    for task in tasks:
-        responsible = await app_state.user_repo.get_by_id(
-            id_=task.responsible_user_id
-        )
-        warnings_list = await get_warnings_with_cross(task)
+    for task in active_tasks.tasks:
         start_date, finish_date = get_start_finish_date(task)
 
         timeline_tasks.append(
@@ -84,19 +95,38 @@ async def get_timeline_tasks():
                 deadline=task.deadline,
                 start_date=start_date,
                 finish_date=finish_date,
-                responsible=responsible,
-                warnings=warnings_list,
+                responsible=active_tasks.responsibles.get(
+                    task.responsible_user_id
+                ),
+                warnings=active_tasks.warnings[task.id],
             )
         )
 
     return GetTimelineTasksResponse(tasks=timeline_tasks)
 
 
+@router.get(
+    path="/timeline_schedule", response_model=GetTimelineScheduleResponse
+)
+async def get_timeline_schedule(request: Request):
+    return await get_cached_response(request, build_timeline_schedule)
+
+
+async def build_timeline_schedule() -> GetTimelineScheduleResponse:
+    tasks = await app_state.task_repo.get_tasks_ordered_by_deadline()
+    scheduled_tasks, critical_path = get_schedule(
+        tasks=tasks, graph=app_state.task_graph
+    )
+    return GetTimelineScheduleResponse(
+        tasks=scheduled_tasks, critical_path=critical_path
+    )
+
+
 @router.get(
     path="/timeline_dependencies",
     response_model=GetTimelineDependenciesResponse,
 )
-async def get_timeline_dependencies(task_id: int):
+async def get_timeline_dependencies(request: Request, task_id: int):
     task = await app_state.task_repo.get_by_id(id_=task_id)
     dependencies = await app_state.task_repo.get_all_task_dependencies(
         task_id=task.id
@@ -109,7 +139,7 @@ async def get_timeline_dependencies(task_id: int):
         )
 
         task = await app_state.task_repo.get_by_id(id_=dependency.id)
-        warnings_list = await get_warnings_with_cross(task)
+        warnings_list = get_warnings_with_cross(task)
         start_date, finish_date = get_start_finish_date(task)
 
         tasks.append(
@@ -126,4 +156,26 @@ async def get_timeline_dependencies(task_id: int):
             )
         )
 
-    return GetTimelineDependenciesResponse(tasks=tasks)
+    return get_model_response(
+        request, GetTimelineDependenciesResponse(tasks=tasks)
+    )
+
+
+@router.post(path="/simulate", response_model=SimulateResponse)
+async def simulate(request: Request, body: SimulateBody):
+    tasks = await app_state.task_repo.get_tasks_ordered_by_deadline()
+    error = get_changes_error({task.id: task for task in tasks}, body.changes)
+    if error:
+        logger.error("Invalid simulation. error=%s", error)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=error
+        )
+
+    return get_model_response(
+        request,
+        SimulateResponse(
+            tasks=get_simulation(
+                tasks=tasks, graph=app_state.task_graph, changes=body.changes
+            )
+        ),
+    )
@@ -0,0 +1,143 @@
+from datetime import date, timedelta
+
+from BASED.conf import TIME_RESERVE_COEF
+from BASED.repository.task import Task, TaskStatusEnum
+from BASED.views.dashboard.models import WarningModel, WarningTypeEnum
+
+
+def get_warnings_list(
+    task: Task, as_of: date | None = None
+) -> list[WarningModel]:
+    warnings = []
+    current_date = as_of or date.today()
+    match task.status:
+        case TaskStatusEnum.to_do:
+            if current_date >= task.deadline - timedelta(
+                days=task.days_for_completion - 1
+            ):
+                warnings.append(
+                    WarningModel(
+                        type=WarningTypeEnum.start_hard, task_id=task.id
+                    )
+                )
+            elif current_date >= task.deadline - timedelta(
+                days=int(task.days_for_completion * TIME_RESERVE_COEF)
+            ):
+                warnings.append(
+                    WarningModel(
+                        type=WarningTypeEnum.start_soft, task_id=task.id
+                    )
+                )
+        case TaskStatusEnum.in_progress:
+            days_in_work = (current_date - task.actual_start_date).days
+            days_to_deadline = task.days_for_completion - days_in_work
+            if days_to_deadline < 0:
+                days_to_deadline = 0
+
+            if current_date >= task.deadline - timedelta(
+                days=days_to_deadline - 1
+            ):
+                warnings.append(
+                    WarningModel(
+                        type=WarningTypeEnum.finish_hard, task_id=task.id
+                    )
+                )
+            elif current_date >= task.deadline - timedelta(
+                days=int(days_to_deadline * TIME_RESERVE_COEF)
+            ):
+                warnings.append(
+                    WarningModel(
+                        type=WarningTypeEnum.finish_soft, task_id=task.id
+                    )
+                )
+
+    if (
+        task.status == TaskStatusEnum.done
+        and task.actual_finish_date > task.deadline
+    ):
+        warnings.append(
+            WarningModel(type=WarningTypeEnum.late_deadline, task_id=task.id)
+        )
+    elif task.status != TaskStatusEnum.done and current_date > task.deadline:
+        warnings.append(
+            WarningModel(type=WarningTypeEnum.late_deadline, task_id=task.id)
+        )
+
+    return warnings
+
+
+def get_cross_warning(
+    task: Task, as_of: date | None = None
+) -> WarningModel | None:
+    """
+    Получает предупреждение о пересечении задачи с самой поздней
+    из зависящих от неё задач. Данные о ней поддерживаются в строке
+    задачи триггерами базы.
+    """
+    if task.task_delay_caused_by is None:
+        return
+
+    soft_start_date = task.deadline - timedelta(
+        days=int(task.days_for_completion * TIME_RESERVE_COEF)
+    )
+    hard_start_date = task.deadline - timedelta(
+        days=task.days_for_completion - 1
+    )
+    current_date = as_of or date.today()
+
+    cross_warning = None
+    if task.cross_finish_date and task.cross_finish_date >= hard_start_date:
+        cross_warning = WarningModel(
+            type=WarningTypeEnum.cross_hard,
+            task_id=task.task_delay_caused_by,
+        )
+    elif task.cross_finish_date and task.cross_finish_date >= soft_start_date:
+        cross_warning = WarningModel(
+            type=WarningTypeEnum.cross_soft,
+            task_id=task.task_delay_caused_by,
+        )
+    if task.cross_finish_date is None and current_date > hard_start_date:
+        cross_warning = WarningModel(
+            type=WarningTypeEnum.cross_hard,
+            task_id=task.task_delay_caused_by,
+        )
+    elif task.cross_finish_date is None and current_date > soft_start_date:
+        cross_warning = WarningModel(
+            type=WarningTypeEnum.cross_soft,
+            task_id=task.task_delay_caused_by,
+        )
+
+    if task.cross_deadline > hard_start_date:
+        cross_warning = WarningModel(
+            type=WarningTypeEnum.cross_hard,
+            task_id=task.task_delay_caused_by,
+        )
+    elif task.cross_deadline > soft_start_date:
+        cross_warning = WarningModel(
+            type=WarningTypeEnum.cross_soft,
+            task_id=task.task_delay_caused_by,
+        )
+
+    return cross_warning
+
+
+def get_warnings_with_cross(
+    task: Task, as_of: date | None = None
+) -> list[WarningModel]:
+    warnings = get_warnings_list(task, as_of)
+    cross_warning = get_cross_warning(task, as_of)
+    if cross_warning:
+        warnings.append(cross_warning)
+
+    return warnings
+
+
+def get_tasks_warnings(
+    tasks: list[Task], as_of: date | None = None
+) -> dict[int, list[WarningModel]]:
+    """
+    Вычисляет предупреждения (включая пересечения) для набора задач
+    на дату as_of (по умолчанию сегодня) без обращений к базе.
+    """
+    as_of = as_of or date.today()
+    return {task.id: get_warnings_with_cross(task, as_of) for task in tasks}
@@ -0,0 +1,55 @@
+import logging
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from BASED.state import app_state
+from BASED.views.dashboard.helpers import get_start_finish_date
+from BASED.views.dashboard.models import TimelineTask
+from BASED.views.dashboard.warnings import get_tasks_warnings
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+EXPORT_CHUNK_SIZE = 500
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def stream_tasks():
+    async for tasks in app_state.task_repo.iter_tasks(
+        chunk_size=EXPORT_CHUNK_SIZE
+    ):
+        yield "".join(f"{task.model_dump_json()}\n" for task in tasks)
+
+
+async def stream_timeline():
+    async for rows in app_state.task_repo.iter_active_tasks_with_relations(
+        chunk_size=EXPORT_CHUNK_SIZE
+    ):
+        warnings = get_tasks_warnings([row.task for row in rows])
+        lines = []
+        for row in rows:
+            start_date, finish_date = get_start_finish_date(row.task)
+            timeline_task = TimelineTask(
+                id=row.task.id,
+                status=row.task.status,
+                title=row.task.title,
+                deadline=row.task.deadline,
+                start_date=start_date,
+                finish_date=finish_date,
+                responsible=row.responsible,
+                warnings=warnings[row.task.id],
+            )
+            lines.append(f"{timeline_task.model_dump_json()}\n")
+        yield "".join(lines)
+
+
+@router.get(path="/tasks.ndjson")
+async def export_tasks():
+    return StreamingResponse(stream_tasks(), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.get(path="/timeline.ndjson")
+async def export_timeline():
+    return StreamingResponse(stream_timeline(), media_type=NDJSON_MEDIA_TYPE)
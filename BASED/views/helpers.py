@@ -0,0 +1,121 @@
+from datetime import date
+from typing import Awaitable, Callable
+
+import msgpack
+from fastapi import Request, Response
+from pydantic import BaseModel
+from starlette import status
+
+from BASED.state import app_state
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+
+def get_media_type(request: Request) -> str:
+    """
+    Выбирает формат ответа по заголовку Accept. MessagePack отдаётся,
+    только если клиент явно указал его не ниже, чем JSON.
+    """
+    accept = request.headers.get("Accept")
+    if not accept:
+        return JSON_MEDIA_TYPE
+
+    qualities = {}
+    for item in accept.split(","):
+        media_type, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[media_type.strip().lower()] = quality
+
+    msgpack_quality = max(
+        qualities.get(name, 0) for name in MSGPACK_MEDIA_TYPES
+    )
+    if msgpack_quality > 0 and msgpack_quality >= qualities.get(
+        JSON_MEDIA_TYPE, 0
+    ):
+        return MSGPACK_MEDIA_TYPE
+
+    return JSON_MEDIA_TYPE
+
+
+def render_model(model: BaseModel, media_type: str) -> bytes:
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(model.model_dump(mode="json", by_alias=True))
+
+    return model.model_dump_json(by_alias=True).encode()
+
+
+def get_model_response(request: Request, model: BaseModel) -> Response:
+    """
+    Сериализует модель в формат, запрошенный клиентом.
+    """
+    media_type = get_media_type(request)
+    return Response(
+        content=render_model(model, media_type),
+        media_type=media_type,
+        headers={"Vary": "Accept"},
+    )
+
+
+def get_etag(data_version: int, media_type: str) -> str:
+    """
+    Строгий ETag по версии данных в базе, текущей дате и формату ответа.
+    Версия общая для всех процессов, поэтому ETag не зависит от того,
+    какой процесс ответил.
+    """
+    return (
+        f'"{data_version}-{date.today():%Y%m%d}'
+        f'-{media_type.rpartition("/")[2]}"'
+    )
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+async def get_cached_response(
+    request: Request, build: Callable[[], Awaitable[BaseModel]]
+) -> Response:
+    """
+    Отвечает 304, если у клиента актуальная версия ответа.
+    Иначе возвращает ответ из кэша, если с момента его построения данные
+    не менялись, либо строит ответ и сохраняет его сериализованным
+    в запрошенном формате.
+    Дата входит в ключ, так как от неё зависят предупреждения.
+    """
+    media_type = get_media_type(request)
+    data_version = await app_state.data_version_repo.get_value()
+    etag = get_etag(data_version, media_type)
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+    if is_not_modified(request, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+        )
+
+    key = (
+        request.url.path,
+        tuple(sorted(request.query_params.multi_items())),
+        media_type,
+        data_version,
+        date.today(),
+    )
+    body = app_state.response_cache.get(key)
+    if body is None:
+        model = await build()
+        body = render_model(model, media_type)
+        app_state.response_cache.set(key, body)
+
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -65,6 +65,7 @@ class EditTaskDeadlineBody(BaseModel):
 
 class GetAllTasksResponse(BaseModel):
     tasks: list[ShortTask]
+    next_cursor: int | None
 
 
 class CustomDependencies(BaseModel):
@@ -78,6 +79,9 @@ class CustomDependencies(BaseModel):
 class GetTasksDescriptionResponse(Task):
     created_timestamp: datetime = Field(alias="created_at")
     responsible_user_id: int = Field(exclude=True)
+    cross_deadline: date | None = Field(exclude=True)
+    task_delay_caused_by: int | None = Field(exclude=True)
+    cross_finish_date: date | None = Field(exclude=True)
     responsible: User  # User
     warnings: list[WarningModel]  # Warning
     dependencies: list[CustomDependencies]
@@ -2,17 +2,15 @@ import logging
 from datetime import date
 
 from asyncpg import ForeignKeyViolationError
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
 from starlette import status
 
-from BASED.repository.task import (
-    DependencyTypeEnum,
-    TaskCreate,
-    TaskStatusEnum,
-)
+from BASED.repository.task import TaskCreate, TaskStatusEnum
 from BASED.repository.user import User
 from BASED.state import app_state
-from BASED.views.dashboard.helpers import get_warnings_with_cross
+from BASED.views.dashboard.helpers import get_snapshot_warnings
+from BASED.views.dashboard.warnings import get_tasks_warnings
+from BASED.views.helpers import get_cached_response, get_model_response
 from BASED.views.task.helpers import check_dependency_and_add
 from BASED.views.task.models import (
     ArchiveTaskBody,
@@ -76,50 +74,21 @@ async def edit_task(body: EditTaskBody):
 
 @router.put(path="/update_task_status")
 async def update_task_status(body: UpdateTaskStatusBody):
-    old_task = await app_state.task_repo.get_by_id(id_=body.task_id)
-    if not old_task:
+    transition = await app_state.task_repo.transition_status(
+        task_id=body.task_id, new_status=body.new_status, as_of=date.today()
+    )
+    if not transition:
         logger.error("Task not found. task_id=%s", body.task_id)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Task not found."
         )
 
-    updated_task = await app_state.task_repo.update_task_status(
-        task_id=body.task_id, new_status=body.new_status
-    )
-
-    match updated_task.status:
-        case TaskStatusEnum.to_do:
-            await app_state.task_repo.update_task_start_finish_dates(
-                task_id=updated_task.id,
-                new_start_date=None,
-                new_finish_date=None,
-            )
-        case TaskStatusEnum.in_progress:
-            await app_state.task_repo.update_task_start_finish_dates(
-                task_id=updated_task.id,
-                new_start_date=(
-                    date.today()
-                    if old_task.status == TaskStatusEnum.to_do
-                    else updated_task.actual_start_date
-                ),
-                new_finish_date=None,
-            )
-        case TaskStatusEnum.done:
-            if old_task.status == TaskStatusEnum.to_do:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Task cannot be done immediately from to_do",
-                )
-
-            await app_state.task_repo.update_task_start_finish_dates(
-                task_id=updated_task.id,
-                new_start_date=updated_task.actual_start_date,
-                new_finish_date=(
-                    date.today()
-                    if old_task.status != TaskStatusEnum.done
-                    else updated_task.actual_start_date
-                ),
-            )
+    _, updated_task = transition
+    if not updated_task:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Task cannot be done immediately from to_do",
+        )
 
 
 @router.post(path="/add_task_dependency")
@@ -179,52 +148,78 @@ async def edit_task_deadline(body: EditTaskDeadlineBody):
 
 @router.get(
     path="/all_tasks",
+    response_model=GetAllTasksResponse,
 )
-async def get_all_tasks():
-    tasks = await app_state.task_repo.get_all_short_tasks()
-    return GetAllTasksResponse(tasks=tasks)
+async def get_all_tasks(
+    request: Request,
+    limit: int = Query(default=100, ge=1, le=1000),
+    after_id: int | None = None,
+):
+    return await get_cached_response(
+        request, lambda: build_all_tasks(limit=limit, after_id=after_id)
+    )
+
+
+async def build_all_tasks(
+    limit: int, after_id: int | None
+) -> GetAllTasksResponse:
+    tasks = await app_state.task_repo.get_short_tasks_page(
+        limit=limit + 1, after_id=after_id
+    )
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = tasks[-1].id
+
+    return GetAllTasksResponse(tasks=tasks, next_cursor=next_cursor)
 
 
 @router.get(
     path="/task_description",
 )
-async def get_task_description(task_id: int):
-    task = await app_state.task_repo.get_by_id(task_id)
-    if task.responsible_user_id:
-        responsible = await app_state.user_repo.get_by_id(
-            id_=task.responsible_user_id
+async def get_task_description(request: Request, task_id: int):
+    neighbourhood = await app_state.task_repo.get_task_neighbourhood(task_id)
+    if not neighbourhood:
+        logger.error("Task not found. task_id=%s", task_id)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Task not found."
         )
-    else:
+
+    task = neighbourhood.task
+    responsible = neighbourhood.responsible
+    if not responsible:
         responsible = User(id=0, name=None)
-    warnings = await get_warnings_with_cross(task)
-    logger.info(warnings)
-    task_depends = await app_state.task_repo.get_task_depends(id_=task_id)
-    dependencies = list()
-    for i in task_depends:
-        i_task = await app_state.task_repo.get_by_id(i.depends_task_id)
-        Cust_dep = CustomDependencies(
-            warnings=await get_warnings_with_cross(i_task),
-            **dict(i_task),
-            type=DependencyTypeEnum.dependent_for,
-        )
-        dependencies.append(Cust_dep)
-    task_depends_off = await app_state.task_repo.get_tasks_dependent_of(
-        dependent_task_id=task_id
-    )
 
-    for i in task_depends_off:
-        i_task = await app_state.task_repo.get_by_id(i.task_id)
-        Cust_dep = CustomDependencies(
-            warnings=await get_warnings_with_cross(i_task),
-            **dict(i_task),
-            type=DependencyTypeEnum.dependent_for,
+    tasks = [task] + [neighbour.task for neighbour in neighbourhood.neighbours]
+    archived_tasks = [i_task for i_task in tasks if i_task.is_archived]
+    active_tasks = [i_task for i_task in tasks if not i_task.is_archived]
+    warnings = await get_snapshot_warnings(
+        task_ids=[i_task.id for i_task in active_tasks]
+    )
+    if warnings is None:
+        warnings = get_tasks_warnings(tasks)
+    else:
+        warnings = {
+            i_task.id: warnings.get(i_task.id, []) for i_task in active_tasks
+        }
+        warnings.update(get_tasks_warnings(archived_tasks))
+
+    dependencies = [
+        CustomDependencies(
+            warnings=warnings[neighbour.task.id],
+            **dict(neighbour.task),
+            type=neighbour.dependency_type,
         )
-        dependencies.append(Cust_dep)
-
-    return GetTasksDescriptionResponse(
-        **dict(task),
-        created_at=task.created_timestamp,
-        responsible=responsible,
-        warnings=warnings,
-        dependencies=dependencies,
+        for neighbour in neighbourhood.neighbours
+    ]
+
+    return get_model_response(
+        request,
+        GetTasksDescriptionResponse(
+            **dict(task),
+            created_at=task.created_timestamp,
+            responsible=responsible,
+            warnings=warnings[task.id],
+            dependencies=dependencies,
+        ),
     )
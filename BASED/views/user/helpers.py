@@ -1,5 +1,13 @@
+from collections import defaultdict
+from html import escape
+from string import Template
+
+from BASED.conf import USER_EMAIL
+from BASED.repository.task_warning import RaisedWarning
 from BASED.views.dashboard.models import WarningModel, WarningTypeEnum
 
+WARNINGS_SUBJECT = "Новые предупреждения по задачам"
+
 
 def get_message_for_task(warning: WarningModel):
     match warning.type:
@@ -17,3 +25,35 @@ def get_message_for_task(warning: WarningModel):
             return "Дедлайн задачи(${task_id}) сильно пересекает эту задачу"
         case WarningTypeEnum.late_deadline:
             return "Дедлайн просрочен"
+
+
+def get_warning_messages(
+    warnings: list[RaisedWarning],
+) -> list[tuple[list[str], str, str]]:
+    """
+    Собирает по одному письму (получатели, тема, текст) на каждого
+    ответственного с перечнем новых предупреждений по его задачам.
+    Письма ответственным без почты и по задачам без ответственного
+    отправляются на USER_EMAIL. Текст письма - HTML, поэтому строки
+    с пользовательскими данными экранируются.
+    """
+    emails = {}
+    lines = defaultdict(list)
+    for warning in warnings:
+        text = Template(
+            get_message_for_task(
+                WarningModel(
+                    type=warning.type, task_id=warning.warning_task_id
+                )
+            )
+        ).safe_substitute(task_id=warning.warning_task_id)
+        task = f"Задача {warning.task_id}"
+        if warning.title:
+            task += f" «{warning.title}»"
+        emails[warning.responsible_user_id] = warning.email or USER_EMAIL
+        lines[warning.responsible_user_id].append(escape(f"{task}: {text}."))
+
+    return [
+        ([emails[user_id]], WARNINGS_SUBJECT, "<br>\n".join(user_lines))
+        for user_id, user_lines in lines.items()
+    ]
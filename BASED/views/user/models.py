@@ -5,10 +5,12 @@ from BASED.repository.user import User
 
 class CreateUserBody(BaseModel):
     name: str
+    email: str | None = None
 
 
 class GetUsersResponse(BaseModel):
     users: list[User]
+    next_cursor: int | None
 
 
 class DeleteUserBody(BaseModel):
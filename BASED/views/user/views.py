@@ -1,12 +1,13 @@
 import logging
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
 from starlette import status
 
 from BASED.conf import USER_EMAIL
 from BASED.repository.task import TaskStatusEnum
 from BASED.state import app_state
-from BASED.views.dashboard.helpers import get_warnings_with_cross
+from BASED.views.dashboard.helpers import get_active_tasks_with_warnings
+from BASED.views.helpers import get_cached_response
 from BASED.views.user.helpers import get_message_for_task
 from BASED.views.user.models import (
     CreateUserBody,
@@ -22,44 +23,58 @@ router = APIRouter()
     path="/user",
 )
 async def create_user(body: CreateUserBody):
-    await app_state.user_repo.create_user(body.name)
+    await app_state.user_repo.create_user(name=body.name, email=body.email)
 
 
 @router.get(
     path="/users",
     response_model=GetUsersResponse,
 )
-async def get_users():
-    users = await app_state.user_repo.get_users()
-    return GetUsersResponse(users=users)
+async def get_users(
+    request: Request,
+    limit: int = Query(default=100, ge=1, le=1000),
+    after_id: int | None = None,
+):
+    return await get_cached_response(
+        request, lambda: build_users(limit=limit, after_id=after_id)
+    )
+
+
+async def build_users(limit: int, after_id: int | None) -> GetUsersResponse:
+    users = await app_state.user_repo.get_users_page(
+        limit=limit + 1, after_id=after_id
+    )
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = users[-1].id
+
+    return GetUsersResponse(users=users, next_cursor=next_cursor)
 
 
 @router.delete(
     path="/user",
 )
 async def del_users(body: DeleteUserBody):
-    await app_state.task_repo.del_responsible_user_id(user_id=body.user_id)
-    is_deleted = await app_state.user_repo.del_user(body.user_id)
-    if not is_deleted:
-        logger.error(
-            "User not found.",
-            body.user_id,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User not found.",
-        )
-    else:
-        return
+    async with app_state.db.transaction():
+        await app_state.task_repo.del_responsible_user_id(user_id=body.user_id)
+        is_deleted = await app_state.user_repo.del_user(body.user_id)
+        if not is_deleted:
+            logger.error("User not found. user_id=%s", body.user_id)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="User not found.",
+            )
 
 
 @router.get(path="/send_report")
 async def send_report_to_user():
-    tasks = await app_state.task_repo.get_tasks_ordered_by_deadline()
+    active_tasks = await get_active_tasks_with_warnings()
+    tasks = active_tasks.tasks
 
     statuses = {}
     for task in tasks:
-        warnings_list = await get_warnings_with_cross(task)
+        warnings_list = active_tasks.warnings[task.id]
 
         if task.status in statuses:
             statuses[task.status].append((warnings_list, task.id))
@@ -80,6 +95,4 @@ async def send_report_to_user():
         if values[0]:
             text += f"\n Имеются не решённые вопросы по задаче {values[1]}."
 
-    await app_state.mail_client.send_message(
-        to=USER_EMAIL, subject="Test", text=text
-    )
+    await app_state.mail_dispatcher.enqueue([([USER_EMAIL], "Test", text)])
@@ -0,0 +1,15 @@
+import os
+
+for name, value in {
+    "TL_BACKEND_BASE_URL": "",
+    "TL_STORAGE_DIR": "/tmp/based",
+    "TL_DATABASE_DSN": "postgresql://localhost/based",
+    "TL_SENTRY_DSN": "",
+    "TL_TIME_RESERVE_COEF": "1.5",
+    "SMTP_HOST": "localhost",
+    "SMTP_PORT": "25",
+    "SMTP_USERNAME": "",
+    "SMTP_PASSWORD": "",
+    "USER_EMAIL": "based@example.com",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,115 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from BASED.repository.db import Database
+
+
+class FakeConnection:
+    def __init__(self, events: list[str]) -> None:
+        self.events = events
+        self.depth = 0
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.depth += 1
+        try:
+            yield
+        except Exception:
+            self.events.append("rollback")
+            raise
+        else:
+            self.events.append("commit")
+        finally:
+            self.depth -= 1
+
+    def is_in_transaction(self) -> bool:
+        return bool(self.depth)
+
+
+class FakePool:
+    def __init__(self) -> None:
+        self.events: list[str] = []
+        self.acquired = 0
+
+    async def acquire(self) -> FakeConnection:
+        self.acquired += 1
+        await asyncio.sleep(0)
+        return FakeConnection(self.events)
+
+    async def release(self, conn: FakeConnection) -> None:
+        pass
+
+    def get_size(self) -> int:
+        return self.acquired
+
+    def get_idle_size(self) -> int:
+        return 0
+
+
+def make_db() -> tuple[Database, FakePool]:
+    pool = FakePool()
+    db = Database(pool, on_commit=lambda: pool.events.append("on_commit"))
+    return db, pool
+
+
+def test_after_commit_runs_after_outer_commit():
+    db, pool = make_db()
+
+    async def run():
+        async with db.transaction():
+            db.after_commit(lambda: pool.events.append("outer"))
+            async with db.transaction():
+                db.after_commit(lambda: pool.events.append("inner"))
+            pool.events.append("body")
+
+    asyncio.run(run())
+
+    assert pool.events == [
+        "commit",
+        "body",
+        "commit",
+        "on_commit",
+        "outer",
+        "inner",
+    ]
+
+
+def test_after_commit_is_dropped_on_rollback():
+    db, pool = make_db()
+
+    async def run():
+        async with db.transaction():
+            db.after_commit(lambda: pool.events.append("callback"))
+            raise ValueError
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+
+    assert pool.events == ["rollback"]
+
+
+def test_after_commit_outside_transaction_runs_at_once():
+    db, pool = make_db()
+
+    db.after_commit(lambda: pool.events.append("callback"))
+
+    assert pool.events == ["callback"]
+
+
+def test_unit_of_work_acquires_one_connection_under_gather():
+    db, pool = make_db()
+
+    async def get_connection():
+        async with db.acquire() as c:
+            return c
+
+    async def run():
+        async with db.unit_of_work():
+            return await asyncio.gather(get_connection(), get_connection())
+
+    first, second = asyncio.run(run())
+
+    assert first is second
+    assert pool.acquired == 1
@@ -0,0 +1,47 @@
+from BASED.repository.graph import TaskGraph
+
+
+def make_graph() -> TaskGraph:
+    graph = TaskGraph()
+    graph.load([1, 2, 3, 4], [(2, 1), (3, 2)])
+    return graph
+
+
+def test_creates_cycle():
+    graph = make_graph()
+
+    assert graph.creates_cycle(1, 3)
+    assert graph.creates_cycle(1, 2)
+    assert graph.creates_cycle(4, 4)
+    assert not graph.creates_cycle(3, 1)
+    assert not graph.creates_cycle(4, 3)
+
+
+def test_set_depends_of_replaces_edges():
+    graph = make_graph()
+
+    graph.set_depends_of(3, {1, 4})
+
+    assert graph.get_depends_of(3) == {1, 4}
+    assert graph.get_dependent_for(2) == set()
+    assert graph.get_dependent_for(1) == {2, 3}
+    assert not graph.creates_cycle(2, 3)
+
+
+def test_edge_arrays_follow_mutations():
+    graph = make_graph()
+
+    task_ids, depends_task_ids = graph.get_edge_arrays()
+    assert sorted(zip(task_ids.tolist(), depends_task_ids.tolist())) == [
+        (2, 1),
+        (3, 2),
+    ]
+
+    graph.remove_edge(3, 2)
+    graph.add_edge(4, 3)
+
+    task_ids, depends_task_ids = graph.get_edge_arrays()
+    assert sorted(zip(task_ids.tolist(), depends_task_ids.tolist())) == [
+        (2, 1),
+        (4, 3),
+    ]
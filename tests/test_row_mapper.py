@@ -0,0 +1,45 @@
+from datetime import date, datetime
+
+from BASED.repository.task import Task, TaskStatusEnum, task_from_row
+from BASED.repository.task_warning import (
+    RaisedWarning,
+    raised_warning_from_row,
+)
+
+
+def test_row_maps_to_model_with_enum():
+    row = {name: None for name in Task.model_fields}
+    row.update(
+        id=1,
+        status="in_progress",
+        deadline=date(2024, 5, 1),
+        days_for_completion=3,
+        is_archived=False,
+        created_timestamp=datetime(2024, 1, 1),
+        extra_column="ignored",
+    )
+
+    task = task_from_row(row)
+
+    assert isinstance(task, Task)
+    assert task.status is TaskStatusEnum.in_progress
+    assert task.deadline == date(2024, 5, 1)
+    assert task.model_fields_set == set(Task.model_fields)
+    assert "extra_column" not in task.model_dump()
+
+
+def test_mapped_model_serializes_like_validated_one():
+    row = {
+        "task_id": 1,
+        "type": "late_deadline",
+        "warning_task_id": 2,
+        "title": None,
+        "responsible_user_id": 3,
+        "email": "user@example.com",
+    }
+
+    assert raised_warning_from_row(row) == RaisedWarning(**row)
+    assert (
+        raised_warning_from_row(row).model_dump_json()
+        == RaisedWarning(**row).model_dump_json()
+    )
@@ -0,0 +1,131 @@
+from datetime import date, datetime, timedelta
+
+from BASED.repository.graph import TaskGraph
+from BASED.repository.task import Task, TaskStatusEnum
+from BASED.views.dashboard.scheduler import get_schedule
+
+AS_OF = date(2024, 5, 1)
+
+
+def make_task(
+    task_id: int,
+    status: TaskStatusEnum = TaskStatusEnum.to_do,
+    deadline_days: int = 30,
+    days_for_completion: int = 5,
+    started_days_ago: int = 0,
+) -> Task:
+    return Task(
+        id=task_id,
+        responsible_user_id=1,
+        status=status,
+        title=None,
+        description=None,
+        deadline=AS_OF + timedelta(days=deadline_days),
+        days_for_completion=days_for_completion,
+        actual_start_date=(
+            None
+            if status == TaskStatusEnum.to_do
+            else AS_OF - timedelta(days=started_days_ago)
+        ),
+        actual_finish_date=(AS_OF if status == TaskStatusEnum.done else None),
+        actual_completion_days=None,
+        is_archived=False,
+        created_timestamp=datetime(2024, 1, 1),
+        cross_deadline=None,
+        task_delay_caused_by=None,
+        cross_finish_date=None,
+    )
+
+
+def make_graph(task_ids: list[int], edges: list[tuple[int, int]]) -> TaskGraph:
+    graph = TaskGraph()
+    graph.load(task_ids, edges)
+    return graph
+
+
+def test_empty_schedule():
+    assert get_schedule([], TaskGraph(), AS_OF) == ([], [])
+
+
+def test_chain_slack_and_critical_path():
+    tasks = [make_task(1), make_task(2), make_task(3, days_for_completion=1)]
+    graph = make_graph([1, 2, 3], [(2, 1)])
+
+    scheduled_tasks, critical_path = get_schedule(tasks, graph, AS_OF)
+
+    first, second, third = scheduled_tasks
+    assert first.earliest_start == AS_OF
+    assert first.earliest_finish == AS_OF + timedelta(days=4)
+    assert second.earliest_start == AS_OF + timedelta(days=5)
+    assert second.earliest_finish == AS_OF + timedelta(days=9)
+    assert first.latest_finish == AS_OF + timedelta(days=25)
+    assert second.latest_finish == AS_OF + timedelta(days=30)
+    assert [task.slack for task in scheduled_tasks] == [21, 21, 30]
+    assert not any(task.is_critical for task in scheduled_tasks)
+    assert critical_path == [1, 2]
+
+
+def test_all_zero_slack_tasks_are_critical():
+    tasks = [
+        make_task(1),
+        make_task(2, deadline_days=9),
+        make_task(3),
+        make_task(4, deadline_days=9),
+        make_task(5, deadline_days=9, days_for_completion=1),
+    ]
+    graph = make_graph([1, 2, 3, 4, 5], [(2, 1), (4, 3)])
+
+    scheduled_tasks, critical_path = get_schedule(tasks, graph, AS_OF)
+
+    assert [task.slack for task in scheduled_tasks] == [0, 0, 0, 0, 9]
+    assert [task.is_critical for task in scheduled_tasks] == [
+        True,
+        True,
+        True,
+        True,
+        False,
+    ]
+    assert critical_path == [1, 2]
+
+
+def test_overdue_task_has_negative_slack():
+    tasks = [
+        make_task(
+            1,
+            TaskStatusEnum.in_progress,
+            deadline_days=-1,
+            started_days_ago=10,
+        ),
+        make_task(2, TaskStatusEnum.done, started_days_ago=3),
+    ]
+
+    scheduled_tasks, _ = get_schedule(tasks, TaskGraph(), AS_OF)
+
+    overdue, done = scheduled_tasks
+    assert overdue.earliest_finish == AS_OF
+    assert overdue.slack == -1
+    assert overdue.is_critical
+    assert done.earliest_start == AS_OF - timedelta(days=3)
+    assert done.earliest_finish == AS_OF
+
+
+def test_dependency_cycle_is_broken():
+    tasks = [make_task(1), make_task(2)]
+    graph = make_graph([1, 2], [(1, 2), (2, 1)])
+
+    scheduled_tasks, critical_path = get_schedule(tasks, graph, AS_OF)
+
+    first, second = scheduled_tasks
+    assert first.earliest_start == AS_OF + timedelta(days=1)
+    assert second.earliest_start == AS_OF + timedelta(days=6)
+    assert critical_path == [1, 2]
+
+
+def test_dependencies_outside_of_tasks_are_ignored():
+    tasks = [make_task(2)]
+    graph = make_graph([1, 2], [(2, 1)])
+
+    scheduled_tasks, critical_path = get_schedule(tasks, graph, AS_OF)
+
+    assert scheduled_tasks[0].earliest_start == AS_OF
+    assert critical_path == [2]
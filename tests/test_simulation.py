@@ -0,0 +1,108 @@
+from datetime import date, datetime, timedelta
+
+from BASED.repository.graph import TaskGraph
+from BASED.repository.task import Task, TaskStatusEnum
+from BASED.views.dashboard.models import (
+    TaskChange,
+    WarningModel,
+    WarningTypeEnum,
+)
+from BASED.views.dashboard.simulation import (
+    get_changes_error,
+    get_simulation,
+    get_warnings_diff,
+    refresh_cross_fields,
+)
+
+AS_OF = date(2024, 5, 1)
+
+
+def make_task(task_id: int, status: TaskStatusEnum) -> Task:
+    return Task(
+        id=task_id,
+        responsible_user_id=1,
+        status=status,
+        title=None,
+        description=None,
+        deadline=AS_OF + timedelta(days=30),
+        days_for_completion=5,
+        actual_start_date=(None if status == TaskStatusEnum.to_do else AS_OF),
+        actual_finish_date=None,
+        actual_completion_days=None,
+        is_archived=False,
+        created_timestamp=datetime(2024, 1, 1),
+        cross_deadline=None,
+        task_delay_caused_by=None,
+        cross_finish_date=None,
+    )
+
+
+def test_chained_changes_to_done_are_allowed():
+    task = make_task(1, TaskStatusEnum.to_do)
+    changes = [
+        TaskChange(task_id=1, status=TaskStatusEnum.in_progress),
+        TaskChange(task_id=1, status=TaskStatusEnum.done),
+    ]
+
+    assert get_changes_error({1: task}, changes) is None
+    simulated = get_simulation([task], TaskGraph(), changes, AS_OF)
+    assert [simulated_task.id for simulated_task in simulated] == [1]
+
+
+def test_chained_changes_back_to_to_do_then_done_are_rejected():
+    task = make_task(1, TaskStatusEnum.in_progress)
+    changes = [
+        TaskChange(task_id=1, status=TaskStatusEnum.to_do),
+        TaskChange(task_id=1, status=TaskStatusEnum.done),
+    ]
+
+    assert get_changes_error({1: task}, changes) is not None
+
+
+def test_unknown_task_is_rejected():
+    changes = [TaskChange(task_id=2, status=TaskStatusEnum.done)]
+
+    assert get_changes_error({}, changes) == "Task not found."
+
+
+def test_cross_fields_prefer_latest_dependent_id_on_equal_deadlines():
+    tasks = {
+        task_id: make_task(task_id, TaskStatusEnum.to_do)
+        for task_id in (1, 2, 3)
+    }
+    graph = TaskGraph()
+    graph.load([1, 2, 3], [(2, 1), (3, 1)])
+
+    refresh_cross_fields(tasks, graph, [1])
+
+    assert tasks[1].cross_deadline == AS_OF + timedelta(days=30)
+    assert tasks[1].task_delay_caused_by == 3
+
+
+def test_longer_task_shifts_its_dependents():
+    tasks = [
+        make_task(1, TaskStatusEnum.to_do),
+        make_task(2, TaskStatusEnum.to_do),
+    ]
+    graph = TaskGraph()
+    graph.load([1, 2], [(2, 1)])
+    changes = [TaskChange(task_id=1, days_for_completion=10)]
+
+    simulated = get_simulation(tasks, graph, changes, AS_OF)
+
+    assert [(task.id, task.shift_days) for task in simulated] == [
+        (1, 5),
+        (2, 5),
+    ]
+    assert simulated[1].earliest_start == AS_OF + timedelta(days=10)
+
+
+def test_warnings_diff():
+    kept = WarningModel(type=WarningTypeEnum.start_soft, task_id=1)
+    resolved = WarningModel(type=WarningTypeEnum.late_deadline, task_id=1)
+    raised = WarningModel(type=WarningTypeEnum.cross_hard, task_id=3)
+
+    assert get_warnings_diff([kept, resolved], [raised, kept]) == (
+        [raised],
+        [resolved],
+    )
@@ -0,0 +1,62 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from BASED.repository.graph import TaskGraph
+from BASED.repository.task import TaskRepository
+from BASED.repository.version import DataVersion
+
+
+class FakeConnection:
+    def __init__(
+        self, task_ids: list[int], edges: list[tuple[int, int]]
+    ) -> None:
+        self.task_ids = task_ids
+        self.edges = edges
+        self.inserted: list[tuple[int, int]] = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def execute(self, sql: str, *args):
+        if "insert" in sql:
+            self.inserted.extend(zip(*args))
+
+    async def fetch(self, sql: str, *args):
+        if "recursive" in sql:
+            return [
+                {"task_id": task_id, "depends_task_id": depends_task_id}
+                for task_id, depends_task_id in self.edges
+            ]
+
+        return [{"id": id_} for id_ in self.task_ids if id_ in args[0]]
+
+
+class FakeDatabase:
+    def __init__(self, conn: FakeConnection) -> None:
+        self._conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self._conn
+
+    def after_commit(self, callback) -> None:
+        callback()
+
+
+def test_batch_rejects_missing_self_and_cyclic_depends():
+    conn = FakeConnection(task_ids=[1, 2, 3], edges=[(2, 1)])
+    graph = TaskGraph()
+    graph.load([1, 2, 3], [(2, 1)])
+    repo = TaskRepository(
+        db=FakeDatabase(conn), graph=graph, version=DataVersion()
+    )
+
+    rejected = asyncio.run(
+        repo.add_task_depends_batch([(1, 2), (3, 1), (1, 3), (4, 1), (2, 2)])
+    )
+
+    assert rejected == [0, 2, 3, 4]
+    assert conn.inserted == [(3, 1)]
+    assert graph.get_depends_of(3) == {1}
+    assert graph.get_dependent_for(1) == {2, 3}
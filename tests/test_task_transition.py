@@ -0,0 +1,80 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+
+from BASED.repository.graph import TaskGraph
+from BASED.repository.task import Task, TaskRepository, TaskStatusEnum
+from BASED.repository.version import DataVersion
+
+AS_OF = date(2024, 5, 1)
+
+
+class FakeConnection:
+    def __init__(self, row: dict | None) -> None:
+        self.row = row
+        self.args: tuple = ()
+
+    async def fetchrow(self, sql: str, *args):
+        self.args = args
+        return self.row
+
+
+class FakeDatabase:
+    def __init__(self, conn: FakeConnection) -> None:
+        self._conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self._conn
+
+
+def make_row(old_status: str, **task) -> dict:
+    row = {name: None for name in Task.model_fields}
+    row.update(task, old_status=old_status)
+    return row
+
+
+def transition(row: dict | None) -> tuple:
+    conn = FakeConnection(row)
+    version = DataVersion()
+    repo = TaskRepository(
+        db=FakeDatabase(conn), graph=TaskGraph(), version=version
+    )
+    result = asyncio.run(
+        repo.transition_status(1, TaskStatusEnum.done, as_of=AS_OF)
+    )
+    return result, conn.args, version.value
+
+
+def test_transition_of_missing_task():
+    assert transition(None) == (None, (1, TaskStatusEnum.done, AS_OF), 0)
+
+
+def test_rejected_transition_keeps_version():
+    result, _, version = transition(make_row("to_do"))
+
+    assert result == (TaskStatusEnum.to_do, None)
+    assert version == 0
+
+
+def test_transition_returns_updated_task():
+    row = make_row(
+        "in_progress",
+        id=1,
+        responsible_user_id=None,
+        status="done",
+        deadline=AS_OF,
+        days_for_completion=3,
+        actual_start_date=date(2024, 4, 29),
+        actual_finish_date=AS_OF,
+        actual_completion_days=3,
+        is_archived=False,
+        created_timestamp=datetime(2024, 1, 1),
+    )
+
+    (old_status, task), _, version = transition(row)
+
+    assert old_status == TaskStatusEnum.in_progress
+    assert task.status == TaskStatusEnum.done
+    assert task.actual_finish_date == AS_OF
+    assert version == 1
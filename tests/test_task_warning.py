@@ -0,0 +1,79 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date
+
+from BASED.repository.task_warning import TaskWarningRepository
+
+AS_OF = date(2024, 5, 1)
+
+
+class FakeConnection:
+    def __init__(self, in_transaction: bool = False) -> None:
+        self.in_transaction = in_transaction
+        self.statements: list[str] = []
+        self.transactions: list[dict] = []
+
+    @asynccontextmanager
+    async def transaction(self, **kwargs):
+        self.transactions.append(kwargs)
+        yield
+
+    def is_in_transaction(self) -> bool:
+        return self.in_transaction
+
+    async def execute(self, sql: str, *args):
+        self.statements.append(" ".join(sql.split()))
+
+    async def executemany(self, sql: str, args: list):
+        self.statements.append(" ".join(sql.split()))
+
+    async def fetch(self, sql: str, *args):
+        self.statements.append(" ".join(sql.split()))
+        return []
+
+    async def fetchval(self, sql: str, *args):
+        self.statements.append(" ".join(sql.split()))
+        if "exists" in sql:
+            return False
+        return 1
+
+
+class FakeDatabase:
+    def __init__(self, conn: FakeConnection) -> None:
+        self._conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self._conn
+
+
+def rebuild(conn: FakeConnection):
+    repo = TaskWarningRepository(db=FakeDatabase(conn))
+    return asyncio.run(
+        repo.rebuild_snapshot(as_of=AS_OF, compute=lambda tasks: [])
+    )
+
+
+def test_rebuild_locks_tables_in_dependency_writers_order():
+    conn = FakeConnection()
+
+    assert rebuild(conn) == 0
+    locks = [sql for sql in conn.statements if sql.startswith("lock")]
+    assert locks == ['lock table "task_depends", "task" in share mode'] * 2
+
+
+def test_rebuild_reads_tasks_in_repeatable_read():
+    conn = FakeConnection()
+
+    rebuild(conn)
+
+    assert {"isolation": "repeatable_read", "readonly": True} in (
+        conn.transactions
+    )
+
+
+def test_rebuild_inside_transaction_keeps_its_isolation():
+    conn = FakeConnection(in_transaction=True)
+
+    assert rebuild(conn) == 0
+    assert conn.transactions == [{}, {}, {}]
@@ -0,0 +1,51 @@
+from BASED.conf import USER_EMAIL
+from BASED.repository.task_warning import RaisedWarning
+from BASED.views.user.helpers import WARNINGS_SUBJECT, get_warning_messages
+
+
+def make_warning(
+    task_id: int,
+    responsible_user_id: int | None,
+    email: str | None,
+    title: str | None = None,
+    type_: str = "late_deadline",
+) -> RaisedWarning:
+    return RaisedWarning(
+        task_id=task_id,
+        type=type_,
+        warning_task_id=task_id + 100,
+        title=title,
+        responsible_user_id=responsible_user_id,
+        email=email,
+    )
+
+
+def test_messages_are_grouped_by_responsible():
+    messages = get_warning_messages(
+        [
+            make_warning(1, 1, "first@example.com"),
+            make_warning(2, 2, None),
+            make_warning(3, 1, "first@example.com", type_="cross_hard"),
+        ]
+    )
+
+    assert messages == [
+        (
+            ["first@example.com"],
+            WARNINGS_SUBJECT,
+            "Задача 1: Дедлайн просрочен.<br>\n"
+            "Задача 3: Дедлайн задачи(103) сильно пересекает эту задачу.",
+        ),
+        ([USER_EMAIL], WARNINGS_SUBJECT, "Задача 2: Дедлайн просрочен."),
+    ]
+
+
+def test_titles_are_escaped():
+    [(_, _, body)] = get_warning_messages(
+        [make_warning(1, None, None, title='<a href="x">&</a>')]
+    )
+
+    assert body == (
+        "Задача 1 «&lt;a href=&quot;x&quot;&gt;&amp;&lt;/a&gt;»:"
+        " Дедлайн просрочен."
+    )